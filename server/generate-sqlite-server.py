@@ -1,8 +1,22 @@
 #!/usr/bin/env python3
 
+import argparse
+import hashlib
+import json
 import os.path
 from os import path
 import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
 
 # ----------------------------------------- Set according to directory - var ----------------------------
 current_path = os.getcwd()
@@ -11,101 +25,2504 @@ current_path = os.getcwd()
 # ------------------------------------------- Global Variables ---------------------------------------------
 users_choice = "yes"
 db_items = []
+manifest_file_name = ".generator-manifest.json"
+routes_start_marker = "// <generated-routes>"
+routes_end_marker = "// </generated-routes>"
+
+# Defaults for every generator option; the manifest, a spec's "options" block and CLI flags override them in that order
+generator_options = {
+    "profile": "default",
+    "pagination": "cursor",
+    "bulk_chunk_size": 500,
+    "cache": False,
+    "cache_max_entries": 1000,
+    "cache_ttl_ms": 30000,
+    "body_limit": "1mb",
+    "compression_threshold": 1024,
+    "keep_alive_timeout_ms": 65000,
+    "cluster": False,
+    "write_queue": False,
+    "slow_query_ms": None,
+    "lazy_routes": False,
+    "concurrency_limit": None,
+    "row_counts": False,
+}
+
+
+# Field spec types ("price:decimal") mapped to Sequelize DataTypes, plus the model validator each one gets
+field_types = {
+    "string": ("STRING", 'notEmpty: {{ msg: "Please provide {name}" }}'),
+    "text": ("TEXT", 'notEmpty: {{ msg: "Please provide {name}" }}'),
+    "integer": ("INTEGER", 'isInt: {{ msg: "{name} must be an integer" }}'),
+    "bigint": ("BIGINT", 'isInt: {{ msg: "{name} must be an integer" }}'),
+    "float": ("FLOAT", 'isFloat: {{ msg: "{name} must be a number" }}'),
+    "double": ("DOUBLE", 'isFloat: {{ msg: "{name} must be a number" }}'),
+    "decimal": ("DECIMAL", 'isDecimal: {{ msg: "{name} must be a decimal" }}'),
+    "boolean": ("BOOLEAN", None),
+    "date": ("DATE", 'isDate: {{ args: true, msg: "{name} must be a date" }}'),
+    "dateonly": ("DATEONLY", 'isDate: {{ args: true, msg: "{name} must be a date" }}'),
+    "json": ("JSON", None),
+    "uuid": ("UUID", 'isUUID: {{ args: 4, msg: "{name} must be a UUID" }}'),
+}
+# The same rules as JS expressions on one value, compiled into validators/<Model>.js so bad input is rejected before any ORM work
+field_checks = {
+    "string": ('typeof {value} === "string" && !isBlank({value})', "Please provide {name}"),
+    "text": ('typeof {value} === "string" && !isBlank({value})', "Please provide {name}"),
+    "integer": ("isInt({value})", "{name} must be an integer"),
+    "bigint": ("isInt({value})", "{name} must be an integer"),
+    "float": ("isFloat({value})", "{name} must be a number"),
+    "double": ("isFloat({value})", "{name} must be a number"),
+    "decimal": ("isDecimal({value})", "{name} must be a decimal"),
+    "boolean": ("isBoolean({value})", "{name} must be true or false"),
+    "date": ("isDate({value})", "{name} must be a date"),
+    "dateonly": ("isDate({value})", "{name} must be a date"),
+    "json": (None, None),
+    "uuid": ("isUUID({value})", "{name} must be a UUID"),
+}
+# Types whose accepted spellings are normalised before they reach the model, as Sequelize's own type would
+field_conversions = {
+    "boolean": "toBoolean({value})",
+}
+field_type_aliases = {"int": "integer", "bool": "boolean", "number": "float", "datetime": "date"}
+field_modifiers = ["index", "unique", "optional", "searchable"]
+searchable_types = ["string", "text"]
+
+
+# ------------------------------------------------------ field specs -----------------------------------------------
+def parse_field(field):
+    # "publishedAt:date:index" and {"name": "publishedAt", "type": "date", "index": true} describe the same field
+    if isinstance(field, dict):
+        parsed = {"name": field.get("name"), "type": field.get("type", "string")}
+        parsed.update({modifier: bool(field.get(modifier)) for modifier in field_modifiers})
+    else:
+        name, *parts = str(field).strip().split(":")
+        field_type = parts.pop(0) if parts and parts[0] not in field_modifiers else "string"
+        unknown = [part for part in parts if part not in field_modifiers]
+        if unknown:
+            sys.exit(f"❌ Unknown modifier {unknown[0]} on field {name} (use {', '.join(field_modifiers)})")
+        parsed = {"name": name, "type": field_type}
+        parsed.update({modifier: modifier in parts for modifier in field_modifiers})
+    parsed["type"] = field_type_aliases.get(parsed["type"], parsed["type"])
+    if not parsed["name"] or not re.match(r"^[A-Za-z_]\w*$", parsed["name"]):
+        sys.exit(f"❌ {parsed['name']!r} is not a valid field name")
+    if parsed["type"] not in field_types:
+        sys.exit(f"❌ Unknown type {parsed['type']} on field {parsed['name']} (use {', '.join(field_types)})")
+    if parsed["searchable"] and parsed["type"] not in searchable_types:
+        sys.exit(f"❌ Field {parsed['name']} is {parsed['type']}; only {' and '.join(searchable_types)} fields can be searchable")
+    return parsed
+
+def parse_index(index, field_names):
+    # Composite indexes are either a bare list of fields or {"fields": [...], "unique": true}
+    parsed = {"fields": list(index), "unique": False} if isinstance(index, list) else {"fields": list(index.get("fields", [])), "unique": bool(index.get("unique"))}
+    missing = [field for field in parsed["fields"] if field not in field_names]
+    if not parsed["fields"] or missing:
+        sys.exit(f"❌ Index {parsed['fields']} refers to unknown fields {missing}")
+    return parsed
+
+def lower_first(name):
+    return name[:1].lower() + name[1:]
+
+def parse_association(association, kind, owner):
+    # "Post" and {"model": "Post", "as": "post", "foreignKey": "postId"} describe the same belongsTo
+    parsed = {"model": association} if isinstance(association, str) else dict(association)
+    target = parsed.get("model")
+    if not target:
+        sys.exit(f"❌ Every {kind} on {owner} needs a model name")
+    if kind == "belongsTo":
+        alias = parsed.get("as") or lower_first(target)
+        return {"model": target, "as": alias, "foreignKey": parsed.get("foreignKey") or f"{alias}Id", "optional": bool(parsed.get("optional"))}
+    return {"model": target, "as": parsed.get("as") or f"{lower_first(target)}s", "foreignKey": parsed.get("foreignKey") or f"{lower_first(owner)}Id"}
+
+def normalize_model(model):
+    fields = [parse_field(field) for field in model["fields"]]
+    belongs_to = [parse_association(association, "belongsTo", model["name"]) for association in model.get("belongsTo", [])]
+    has_many = [parse_association(association, "hasMany", model["name"]) for association in model.get("hasMany", [])]
+    foreign_keys = [association["foreignKey"] for association in belongs_to]
+    field_names = [field["name"] for field in fields] + foreign_keys + ["id", "createdAt", "updatedAt"]
+    indexes = [parse_index(index, field_names) for index in model.get("indexes", [])]
+    # "version": true adds an optimistic-locking column that every update bumps
+    return {"name": model["name"], "fields": fields, "indexes": indexes, "version": bool(model.get("version")), "belongsTo": unique_foreign_keys(belongs_to), "hasMany": has_many}
+
+def unique_foreign_keys(belongs_to):
+    # One entry per foreign key, so an implied belongsTo added by normalize_models is not added twice
+    return list({association["foreignKey"]: association for association in belongs_to}.values())
+
+def normalize_models(models):
+    # Associations span models, so foreign keys are added once every model is parsed
+    models = [normalize_model(model) for model in models]
+    by_name = {model["name"]: model for model in models}
+    for model in models:
+        for kind in ("belongsTo", "hasMany"):
+            for association in model[kind]:
+                if association["model"] not in by_name:
+                    sys.exit(f"❌ {model['name']} {kind} {association['model']}, which is not in the spec")
+    # hasMany reads the child's foreign key, so a child without a matching belongsTo gets one
+    for model in models:
+        for association in model["hasMany"]:
+            child = by_name[association["model"]]
+            foreign_key = association["foreignKey"]
+            if not any(existing["foreignKey"] == foreign_key for existing in child["belongsTo"]):
+                alias = re.sub(r"Id$", "", foreign_key) or lower_first(model["name"])
+                child["belongsTo"].append({"model": model["name"], "as": alias, "foreignKey": foreign_key, "optional": False})
+    for model in models:
+        names = {field["name"] for field in model["fields"]}
+        for association in model["belongsTo"]:
+            if association["foreignKey"] not in names:
+                model["fields"].append({"name": association["foreignKey"], "type": "integer", "index": True, "unique": False, "optional": association["optional"], "searchable": False})
+                names.add(association["foreignKey"])
+        aliases = [association["as"] for kind in ("belongsTo", "hasMany") for association in model[kind]]
+        clashes = sorted({alias for alias in aliases if aliases.count(alias) > 1 or alias in names})
+        if clashes:
+            sys.exit(f"❌ Association name {clashes[0]} on {model['name']} is used twice or clashes with a field (set \"as\")")
+    return models
+
+def model_dependents(models, name):
+    # Models whose rows point at this one through a belongsTo foreign key
+    return [model["name"] for model in models if any(association["model"] == name for association in model["belongsTo"])]
+
+def has_associations(model):
+    return bool(model["belongsTo"] or model["hasMany"])
+
+def model_indexes(model):
+    indexes = [{"fields": [field["name"]], "unique": field["unique"]} for field in model["fields"] if field["index"] or field["unique"]]
+    # Backs the default list order in read{name}: ORDER BY createdAt DESC, id DESC
+    indexes.append({"fields": ["createdAt", "id"], "unique": False})
+    # Keeps the MAX(updatedAt) freshness check for conditional list requests off the table
+    indexes.append({"fields": ["updatedAt"], "unique": False})
+    return indexes + [index for index in model["indexes"] if index not in indexes]
+
+def searchable_fields(model):
+    return [field["name"] for field in model["fields"] if field["searchable"]]
+
+def table_name(name):
+    return f"{name.lower()}s"
+
+def index_name(table, fields):
+    # Same name Sequelize gives an unnamed index, so migrations line up with tables sync() created
+    name = re.sub(r"([A-Z])", r"_\1", f"{table}_{'_'.join(fields)}").lower()
+    return name[1:] if name.startswith("_") else name
+
+
+# ------------------------------------------------------ migrations -----------------------------------------------
+def migration_columns(model):
+    columns = {"id": "{ type: DataTypes.INTEGER, primaryKey: true, autoIncrement: true, allowNull: false }"}
+    references = {association["foreignKey"]: table_name(association["model"]) for association in model["belongsTo"]}
+    for field in model["fields"]:
+        column = f'type: DataTypes.{field_types[field["type"]][0]}, allowNull: {"true" if field["optional"] else "false"}'
+        if field["name"] in references:
+            # RESTRICT: a parent cannot be deleted while rows still point at it (the API answers 409)
+            column += f', references: {{ model: "{references[field["name"]]}", key: "id" }}, onDelete: "RESTRICT"'
+        columns[field["name"]] = f"{{ {column} }}"
+    columns["createdAt"] = "{ type: DataTypes.DATE, allowNull: false }"
+    columns["updatedAt"] = "{ type: DataTypes.DATE, allowNull: false }"
+    if model["version"]:
+        columns["version"] = "{ type: DataTypes.INTEGER, allowNull: false, defaultValue: 0 }"
+    return columns
+
+def migration_indexes(model):
+    table = table_name(model["name"])
+    return {index_name(table, index["fields"]): index for index in model_indexes(model)}
+
+def render_create_index(name, table, index):
+    fields = ", ".join(f'"{field}"' for field in index["fields"])
+    unique = ", { unique: true }" if index["unique"] else ""
+    return f'await createIndex("{name}", "{table}", [{fields}]{unique});'
+
+def migration_steps(previous, model, counted=False):
+    # counted: whether the previous generation already kept row counts for its tables
+    table = table_name(model["name"])
+    row_counts = generator_options["row_counts"]
+    columns = migration_columns(model)
+    indexes = migration_indexes(model)
+    searchable = searchable_fields(model)
+    if previous is None:
+        column_lines = ",\n".join(f"      {column}: {definition}" for column, definition in columns.items())
+        steps = [f'await queryInterface.createTable("{table}", {{\n{column_lines}\n    }}, {{ transaction }});']
+        steps += [render_create_index(name, table, index) for name, index in indexes.items()]
+        if searchable:
+            steps.append(f'await searchIndex("{table}", {json.dumps(searchable)});')
+        if row_counts:
+            steps.append(f'await rowCounter("{table}");')
+        return steps
+    previous_columns = migration_columns(previous)
+    previous_indexes = migration_indexes(previous)
+    steps = [f'await dropIndex("{name}");' for name in previous_indexes if name not in indexes]
+    # changeColumn and removeColumn rebuild the table in SQLite, which loses its indexes and triggers
+    rebuilt = False
+    for column, definition in columns.items():
+        if column not in previous_columns:
+            if "allowNull: false" in definition and "defaultValue" not in definition:
+                # SQLite cannot add a NOT NULL column without a default to a table that may have rows;
+                # the model still rejects missing values on every new write
+                definition = definition.replace("allowNull: false", "allowNull: true")
+            steps.append(f'await queryInterface.addColumn("{table}", "{column}", {definition}, {{ transaction }});')
+        elif previous_columns[column] != definition:
+            steps.append(f'await queryInterface.changeColumn("{table}", "{column}", {definition}, {{ transaction }});')
+            rebuilt = True
+    for column in previous_columns:
+        if column not in columns:
+            steps.append(f'await queryInterface.removeColumn("{table}", "{column}", {{ transaction }});')
+            rebuilt = True
+    steps += [render_create_index(name, table, index) for name, index in indexes.items() if rebuilt or name not in previous_indexes]
+    if searchable and (rebuilt or searchable != searchable_fields(previous)):
+        steps.append(f'await searchIndex("{table}", {json.dumps(searchable)});')
+    elif searchable_fields(previous) and not searchable:
+        steps.append(f'await dropSearchIndex("{table}");')
+    if row_counts and (rebuilt or not counted):
+        steps.append(f'await rowCounter("{table}");')
+    elif counted and not row_counts:
+        steps.append(f'await dropRowCounter("{table}");')
+    return steps
+
+def render_migration(previous_models, models, counted=False):
+    # Returns (file name stem, contents) for the schema change from previous_models to models, or None
+    previous_by_name = {model["name"]: model for model in normalize_models(previous_models)}
+    names = [model["name"] for model in models]
+    for name in previous_by_name:
+        if name not in names:
+            print(f"ℹ️ {name} is no longer in the spec; its table {table_name(name)} is left in place...")
+    summary = []
+    blocks = []
+    for model in normalize_models(models):
+        previous = previous_by_name.get(model["name"])
+        steps = migration_steps(previous, model, counted)
+        if steps:
+            summary.append(f'{"create" if previous is None else "alter"}-{model["name"].lower()}')
+            blocks.append(f"    // {model['name']}\n" + "\n".join(f"    {step}" for step in steps))
+    if not blocks:
+        return None
+    stem = time.strftime("%Y%m%d%H%M%S", time.gmtime()) + "-" + "-".join(summary)[:60].rstrip("-")
+    # changeColumn/removeColumn drop and recreate the table, which migrate() has to run with foreign keys off
+    rebuilds = any("queryInterface.changeColumn(" in block or "queryInterface.removeColumn(" in block for block in blocks)
+    flags = "\n  rebuildsTables: true," if rebuilds else ""
+    contents = f'''// Generated by generate-sqlite-server.py from the spec's changes since the last run. Applied once, in
+// file-name order, by utils/migrations.js; edit it before it has run anywhere if you need to (e.g. backfills).
+module.exports = {{{flags}
+  up: async ({{ queryInterface, DataTypes, transaction, createIndex, dropIndex, searchIndex, dropSearchIndex, rowCounter, dropRowCounter }}) => {{
+{chr(10).join(blocks)}
+  }}
+}};
+'''
+    return stem, contents
+
+def write_migration(root, previous_models, models, counted=False):
+    migrations_path = os.path.join(root, "migrations")
+    existing = sorted(name for name in os.listdir(migrations_path) if name.endswith(".js")) if path.exists(migrations_path) else []
+    # The first migration is a baseline of every model, so a fresh database can be built from migrations alone
+    migration = render_migration(previous_models if existing else [], models, counted and bool(existing))
+    if not migration:
+        return None
+    stem, contents = migration
+    file_name = f"{stem}.js"
+    while file_name in existing or (existing and file_name < existing[-1]):
+        # Same second as (or clock behind) the newest migration: keep name order equal to generation order
+        stem = f"{int(stem[:14]) + 1}{stem[14:]}"
+        file_name = f"{stem}.js"
+    os.makedirs(migrations_path, exist_ok=True)
+    write_to_file(os.path.join(migrations_path, file_name), contents)
+    return file_name
 
 
 # ------------------------------------------------------ functions -----------------------------------------------
-def create_config_files():
-    config_file = '''const { Sequelize } = require('sequelize');
-const path = require('path');
+def render_sqlite_pragmas():
+    if generator_options["profile"] == "throughput":
+        pragmas = '''
+// Throughput profile: WAL lets readers run alongside the single writer and synchronous=NORMAL
+// only fsyncs at checkpoints. See "SQLite Performance Profile" in README.md for the durability trade-off.
+const pragmas = [
+  'PRAGMA journal_mode = WAL',
+  'PRAGMA synchronous = NORMAL',
+  'PRAGMA mmap_size = 268435456',
+  'PRAGMA cache_size = -64000',
+  'PRAGMA temp_store = MEMORY',
+  'PRAGMA busy_timeout = 5000'
+];
+'''
+    elif generator_options["cluster"] or generator_options["write_queue"]:
+        pragmas = '''
+// Reads and writes use separate connections (one per worker in cluster mode). WAL lets the reads run
+// in parallel with the one writer, and busy_timeout makes a writer queue for the lock instead of failing.
+const pragmas = [
+  'PRAGMA journal_mode = WAL',
+  'PRAGMA busy_timeout = 5000'
+];
+'''
+    else:
+        return ""
+    return pragmas + render_writer_connection() + '''
+// Sequelize opens a separate SQLite connection per transaction, so every connection is tuned as it is handed out
+const tunedConnections = new WeakMap();
+const getConnection = sequelize.connectionManager.getConnection.bind(sequelize.connectionManager);
+sequelize.connectionManager.getConnection = async (options) => {
+  const connection = await getConnection(options);
+  if (!tunedConnections.has(connection)) {
+    tunedConnections.set(connection, new Promise((resolve, reject) => {
+      connection.exec(pragmas.join('; '), (error) => (error ? reject(error) : resolve()));
+    }));
+  }
+  await tunedConnections.get(connection);
+  return connection;
+};
+'''
 
-const sequelize = new Sequelize({
-  dialect: 'sqlite',
-  storage: path.join(__dirname, '../database.sqlite'),
-  logging: false,
+def render_writer_connection():
+    if not generator_options["write_queue"]:
+        return ""
+    return '''
+// Sequelize opens (and closes) a fresh SQLite connection for every transaction. With the write queue
+// transactions are group commits that never overlap, so they all reuse one long-lived writer connection.
+let writer = null;
+const getReadOrWriteConnection = sequelize.connectionManager.getConnection.bind(sequelize.connectionManager);
+sequelize.connectionManager.getConnection = async (options = {}) => {
+  if (!options.uuid) {
+    return getReadOrWriteConnection(options);
+  }
+  writer = await getReadOrWriteConnection({ ...options, uuid: 'writer' });
+  return writer;
+};
+const releaseConnection = sequelize.connectionManager.releaseConnection.bind(sequelize.connectionManager);
+sequelize.connectionManager.releaseConnection = async (connection, force) => {
+  if (connection === writer && !force) return;
+  return releaseConnection(connection, force);
+};
+'''
+
+def render_slow_query_log():
+    if generator_options["slow_query_ms"] is None:
+        return ""
+    return f'''
+// Slow-query log: queries over SLOW_QUERY_MS are written as one JSON line each. The first time a query
+// shape is seen its EXPLAIN QUERY PLAN is attached; a "SCAN" without an index usually means one is missing.
+const SLOW_QUERY_MS = parseInt(process.env.SLOW_QUERY_MS) || {generator_options["slow_query_ms"]};
+const explainedQueries = new Set();
+
+// Literals are blanked out so "WHERE id = 1" and "WHERE id = 2" count as the same query
+const queryShape = (sql) => sql.replace(/'(?:[^']|'')*'/g, '?').replace(/\\b\\d+(\\.\\d+)?\\b/g, '?').replace(/\\s+/g, ' ');
+
+const logSlowQuery = async (message, milliseconds, options = {{}}) => {{
+  if (typeof milliseconds !== 'number' || milliseconds < SLOW_QUERY_MS) return;
+  const sql = String(message).replace(/^Executed \\([^)]*\\): /, '');
+  const entry = {{ level: 'warn', msg: 'slow query', ms: milliseconds, type: options.type, sql: sql.slice(0, 2000) }};
+  const shape = queryShape(sql);
+  if (!explainedQueries.has(shape) && /^\\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\\b/i.test(sql)) {{
+    if (explainedQueries.size >= 1000) explainedQueries.clear();
+    explainedQueries.add(shape);
+    try {{
+      const plan = await sequelize.query(`EXPLAIN QUERY PLAN ${{sql}}`, {{ bind: options.bind, type: QueryTypes.SELECT, logging: false }});
+      entry.plan = plan.map((step) => step.detail);
+      entry.fullScan = entry.plan.some((detail) => /^SCAN (?!CONSTANT ROW|.*(USING (COVERING )?INDEX|VIRTUAL TABLE))/.test(detail));
+    }} catch (error) {{
+      entry.planError = error.message;
+    }}
+  }}
+  console.warn(JSON.stringify(entry));
+}};
+'''
+
+def render_config_file():
+    cluster_import = "const cluster = require('cluster');\n" if generator_options["cluster"] else ""
+    schema = '''
+    // Versioned migrations (migrations/) instead of sequelize.sync(): a boot with nothing to apply reads one row
+    const { version, applied } = await migrate(sequelize);
+    console.log(`✅ Schema at ${version || 'no migrations'}${applied.length ? ` (applied ${applied.join(', ')})` : ''}`);'''
+    if generator_options["cluster"]:
+        schema = '''
+    // In cluster mode the primary migrates once, before any worker is forked
+    if (!cluster.isWorker) {''' + schema.replace("\n", "\n  ") + "\n    }"
+    if generator_options["write_queue"]:
+        schema += '''
+    // Every write goes through utils/writer.js in its own transaction, so the shared connection only reads
+    await sequelize.query('PRAGMA query_only = ON');'''
+    # The SQLite dialect ignores pool settings: reads share one connection and transactions open their own
+    pool = "" if generator_options["write_queue"] else ''',
   pool: {
     max: 5,
     min: 0,
     acquire: 30000,
     idle: 10000
-  }
+  }'''
+    # Workers share the database file. A DEFERRED transaction that reads before it writes (bulk routes check
+    # existingIds first) cannot upgrade to the write lock once another worker has committed, and fails at
+    # once with SQLITE_BUSY whatever busy_timeout says. IMMEDIATE takes the lock at BEGIN, where busy_timeout waits.
+    transaction_type = ",\n  // BEGIN IMMEDIATE: take the write lock up front so busy_timeout queues writers across workers\n  transactionType: 'IMMEDIATE'" if generator_options["cluster"] else ""
+    slow_query_log = render_slow_query_log()
+    config_file = '''const { ''' + ("QueryTypes, Sequelize" if slow_query_log else "Sequelize") + ''' } = require('sequelize');
+const path = require('path');
+''' + cluster_import + "const { observeQuery } = require('../middleware/metrics');\nconst { migrate } = require('../utils/migrations');\n" + '''
+const sequelize = new Sequelize({
+  dialect: 'sqlite',
+  storage: path.join(__dirname, '../database.sqlite'),
+  // benchmark hands every query's duration to the logging callback, which feeds /metrics
+  benchmark: true,
+  logging: ''' + ("(message, milliseconds, options) => {\n    observeQuery(message, milliseconds, options);\n    logSlowQuery(message, milliseconds, options);\n  }" if slow_query_log else "observeQuery") + transaction_type + pool + '''
 });
-
+''' + slow_query_log + render_sqlite_pragmas() + '''
 const connectDB = async () => {
   try {
     await sequelize.authenticate();
-    console.log('✅ Database connected');
-    await sequelize.sync();
-    console.log('✅ Database synchronized');
+    console.log('✅ Database connected');''' + schema + '''
   } catch (error) {
     console.error('❌ Unable to connect to the database:', error);
   }
 };
 
 module.exports = { sequelize, connectDB };'''
-    config_file_path = config_directory + "/database.js"
-    try:
-        print("🛑 tried")
-        write_to_file(config_file_path, config_file)
-        return print("Config Files Successfully Created...")
-    except:
-        return print("Something Went Wrong When Creating Config Files...")
-
-def create_controller_files(name, *args):
-    controller_first = f'const {name} = require("../models/{name}"); exports.create{name} = async (req, res) => {{  try {{ const new{name} = await {name}.create({{'
-    controller_second = []
-    controller_third = f' }}); res.status(201).json(new{name}); }} catch (err) {{ console.log(err); res.status(500).json({{ error: err.message }}); }} }}; exports.read{name} = async (req, res) => {{ const page = parseInt(req.query.page) || 0; const limit = parseInt(req.query.limit) || 25; const offset = page * limit; try {{ const result = await {name}.findAndCountAll({{ limit, offset, order: [["createdAt", "DESC"]] }}); res.json({{ data: result.rows, total: result.count, page, limit }}); }} catch (err) {{ console.log(err); res.status(500).json({{ error: err.message }}); }} }}; exports.read{name}FromID = async (req, res) => {{ try {{ const result = await {name}.findByPk(req.params.id); if (!result) {{ return res.status(404).json({{ error: "Record not found" }}); }} res.json(result); }} catch (err) {{ console.log(err); res.status(500).json({{ error: err.message }}); }} }}; exports.update{name} = async (req, res) => {{ try {{ const [updated] = await {name}.update({{'
-    controller_fourth = []
-    controller_fifth = f' }}, {{ where: {{ id: req.params.id }}, returning: true }}); if (updated === 0) {{ return res.status(404).json({{ error: "Record not found" }}); }} const result = await {name}.findByPk(req.params.id); res.json(result); }} catch (err) {{ console.log(err); res.status(500).json({{ error: err.message }}); }} }}; exports.delete{name} = async (req, res) => {{ try {{ const deleted = await {name}.destroy({{ where: {{ id: req.params.id }} }}); if (deleted === 0) {{ return res.status(404).json({{ error: "Record not found" }}); }} res.json({{ message: "Record deleted successfully" }}); }} catch (err) {{ console.log(err); res.status(500).json({{ error: err.message }}); }} }};'
-    controller_file_path = controller_directory + f'/{name}.js'
-    for arg in args:
-        for a in arg:
-            file = f'{a}: req.body.{a},'
-            controller_second.append(file)
-            controller_fourth.append(file)   
-    try:
-        entire_file = controller_first + ''.join(controller_second) + controller_third + ''.join(controller_fourth) + controller_fifth
-        write_to_file(controller_file_path, entire_file)
-        return print("Controller Files Successfully Created...")
-    except:
-        return print("Something Went Wrong When Creating Controller Files...")
+    return config_file
+
+def render_error_handler(foreign_keys=False):
+    foreign_key_error = '''
+    if (err.name === "SequelizeForeignKeyConstraintError") {
+      return res.status(409).json({ error: "A related record does not exist, or other records still point at this one" });
+    }''' if foreign_keys else ""
+    return f'''  }} catch (err) {{{foreign_key_error}
+    console.log(err);
+    res.status(500).json({{ error: err.message }});
+  }}'''
+
+def render_cache_file():
+    cluster_import = 'const cluster = require("cluster");\n\n' if generator_options["cluster"] else ""
+    return f'''{cluster_import}// Bounded LRU + TTL cache for serialized read responses. Entries hold the JSON string, so a hit
+// skips both the query and the serialization. Write handlers invalidate the exact keys they touch.
+const CACHE_MAX_ENTRIES = parseInt(process.env.CACHE_MAX_ENTRIES) || {generator_options["cache_max_entries"]};
+const CACHE_TTL_MS = parseInt(process.env.CACHE_TTL_MS) || {generator_options["cache_ttl_ms"]};
+
+class ResponseCache {{
+  constructor(maxEntries, ttl) {{
+    this.maxEntries = maxEntries;
+    this.ttl = ttl;
+    // A Map iterates in insertion order, so its first key is always the least recently used
+    this.entries = new Map();
+    this.listKeys = new Map();
+    this.hits = 0;
+    this.misses = 0;
+    this.evictions = 0;
+  }}
+
+  key(model, id) {{
+    return `${{model}}:id:${{id}}`;
+  }}
+
+  listKey(model, url) {{
+    return `${{model}}:list:${{url}}`;
+  }}
+
+  get(key) {{
+    const entry = this.entries.get(key);
+    if (!entry || entry.expires <= Date.now()) {{
+      if (entry) {{
+        this.delete(key);
+      }}
+      this.misses += 1;
+      return undefined;
+    }}
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits += 1;
+    return entry.value;
+  }}
+
+  set(key, value) {{
+    const [model, kind] = key.split(":");
+    this.entries.delete(key);
+    this.entries.set(key, {{ value, expires: Date.now() + this.ttl }});
+    if (kind === "list") {{
+      if (!this.listKeys.has(model)) {{
+        this.listKeys.set(model, new Set());
+      }}
+      this.listKeys.get(model).add(key);
+    }}
+    while (this.entries.size > this.maxEntries) {{
+      this.delete(this.entries.keys().next().value);
+      this.evictions += 1;
+    }}
+  }}
+
+  delete(key) {{
+    this.entries.delete(key);
+    const [model, kind] = key.split(":");
+    if (kind === "list" && this.listKeys.has(model)) {{
+      this.listKeys.get(model).delete(key);
+    }}
+  }}
+
+  // Drops the given records plus every cached list page of the model
+  invalidate(model, ids = []) {{
+    for (const id of ids) {{
+      this.entries.delete(this.key(model, id));
+    }}
+    const lists = this.listKeys.get(model);
+    if (lists) {{
+      for (const key of lists) {{
+        this.entries.delete(key);
+      }}
+      lists.clear();
+    }}
+  }}
+
+  // Stores the body together with the ETag/Last-Modified the handler already set on res
+  send(res, key, body) {{
+    const payload = JSON.stringify(body);
+    this.set(key, {{ payload, etag: res.get("ETag"), lastModified: res.get("Last-Modified") }});
+    res.type("json").send(payload);
+  }}
+
+  reply(req, res, cached) {{
+    if (cached.etag) {{
+      res.set("ETag", cached.etag);
+    }}
+    if (cached.lastModified) {{
+      res.set("Last-Modified", cached.lastModified);
+    }}
+    if (req.fresh) {{
+      return res.status(304).end();
+    }}
+    res.type("json").send(cached.payload);
+  }}
+
+  stats() {{
+    const lookups = this.hits + this.misses;
+    return {{
+      entries: this.entries.size,
+      maxEntries: this.maxEntries,
+      ttlMs: this.ttl,
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+      hitRate: lookups ? this.hits / lookups : 0
+    }};
+  }}
+}}
+
+const cache = new ResponseCache(CACHE_MAX_ENTRIES, CACHE_TTL_MS);
+{render_cache_relay()}
+module.exports = {{ cache, ResponseCache }};
+'''
+
+def render_cache_relay():
+    if not generator_options["cluster"]:
+        return ""
+    return '''
+// Each cluster worker has its own cache, so invalidations are relayed through the primary (cluster.js).
+// Otherwise a write handled by one worker would leave the others serving the old response.
+if (cluster.isWorker) {
+  const invalidate = cache.invalidate.bind(cache);
+  cache.invalidate = (model, ids = []) => {
+    invalidate(model, ids);
+    process.send({ type: "cache:invalidate", model, ids });
+  };
+  process.on("message", (message) => {
+    if (message && message.type === "cache:invalidate") {
+      invalidate(message.model, message.ids);
+    }
+  });
+}
+'''
+
+def render_metrics_collectors():
+    collectors = []
+    if generator_options["cache"]:
+        collectors.append('''
+  const cache = require("./cache").cache.stats();
+  lines.push("# TYPE cache_hits_total counter", `cache_hits_total ${cache.hits}`);
+  lines.push("# TYPE cache_misses_total counter", `cache_misses_total ${cache.misses}`);
+  lines.push("# TYPE cache_evictions_total counter", `cache_evictions_total ${cache.evictions}`);
+  lines.push("# TYPE cache_entries gauge", `cache_entries ${cache.entries}`);''')
+    if generator_options["write_queue"]:
+        collectors.append('''
+  const writes = require("../utils/writer").stats();
+  lines.push("# TYPE write_queue_operations_total counter", `write_queue_operations_total ${writes.operations}`);
+  lines.push("# TYPE write_queue_batches_total counter", `write_queue_batches_total ${writes.batches}`);
+  lines.push("# TYPE write_queue_pending gauge", `write_queue_pending ${writes.pending}`);''')
+    if generator_options["concurrency_limit"]:
+        collectors.append('''
+  const limiter = require("./limiter").stats();
+  lines.push("# TYPE concurrency_limit gauge", `concurrency_limit ${limiter.limit}`);
+  lines.push("# TYPE concurrency_queued gauge", ...Object.entries(limiter.queued).map(([priority, count]) => `concurrency_queued{priority="${priority}"} ${count}`));
+  lines.push("# TYPE requests_shed_total counter", ...Object.entries(limiter.shed).map(([reason, count]) => `requests_shed_total{reason="${reason}"} ${count}`));''')
+    return "".join(collectors)
+
+def render_metrics_file():
+    return f'''// Prometheus metrics without a client library: every observation is a few array increments, so this
+// stays on under load. Histogram buckets are stored per bucket and only made cumulative when scraped.
+const BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5];
+
+class Histogram {{
+  constructor(name, help, labelNames) {{
+    this.name = name;
+    this.help = help;
+    this.labelNames = labelNames;
+    this.series = new Map();
+  }}
+
+  observe(labels, seconds) {{
+    const key = labels.join("\\u0000");
+    let series = this.series.get(key);
+    if (!series) {{
+      series = {{ labels, counts: new Array(BUCKETS.length + 1).fill(0), sum: 0 }};
+      this.series.set(key, series);
+    }}
+    let bucket = 0;
+    while (bucket < BUCKETS.length && seconds > BUCKETS[bucket]) {{
+      bucket += 1;
+    }}
+    series.counts[bucket] += 1;
+    series.sum += seconds;
+  }}
+
+  render(lines) {{
+    lines.push(`# HELP ${{this.name}} ${{this.help}}`, `# TYPE ${{this.name}} histogram`);
+    for (const {{ labels, counts, sum }} of this.series.values()) {{
+      const base = this.labelNames.map((name, i) => `${{name}}="${{String(labels[i]).replace(/["\\\\\\n]/g, "_")}}"`).join(",");
+      let cumulative = 0;
+      BUCKETS.forEach((le, i) => {{
+        cumulative += counts[i];
+        lines.push(`${{this.name}}_bucket{{${{base}},le="${{le}}"}} ${{cumulative}}`);
+      }});
+      cumulative += counts[BUCKETS.length];
+      lines.push(`${{this.name}}_bucket{{${{base}},le="+Inf"}} ${{cumulative}}`);
+      lines.push(`${{this.name}}_sum{{${{base}}}} ${{sum}}`, `${{this.name}}_count{{${{base}}}} ${{cumulative}}`);
+    }}
+  }}
+}}
+
+const requestDuration = new Histogram("http_request_duration_seconds", "HTTP request latency by route and status", ["method", "route", "status"]);
+const queryDuration = new Histogram("db_query_duration_seconds", "Sequelize query latency by statement type", ["type"]);
+let inFlight = 0;
+
+// Labels use the route pattern (/api/Product/read/:id), never the raw URL, so ids cannot explode the series count
+const metricsMiddleware = (req, res, next) => {{
+  const start = process.hrtime.bigint();
+  inFlight += 1;
+  let done = false;
+  const finish = () => {{
+    if (done) return;
+    done = true;
+    inFlight -= 1;
+    const route = req.route ? req.baseUrl + req.route.path : "unmatched";
+    requestDuration.observe([req.method, route, res.statusCode], Number(process.hrtime.bigint() - start) / 1e9);
+  }};
+  res.once("finish", finish);
+  res.once("close", finish);
+  next();
+}};
+
+// Called by Sequelize for every query (config/database.js sets benchmark: true and logging to this)
+const observeQuery = (sql, milliseconds, options = {{}}) => {{
+  if (typeof milliseconds !== "number") return;
+  queryDuration.observe([options.type || "RAW"], milliseconds / 1000);
+}};
+
+const metricsHandler = (req, res) => {{
+  const lines = [];
+  requestDuration.render(lines);
+  queryDuration.render(lines);
+  lines.push("# HELP http_requests_in_flight Requests currently being handled", "# TYPE http_requests_in_flight gauge", `http_requests_in_flight ${{inFlight}}`);
+  lines.push("# TYPE process_resident_memory_bytes gauge", `process_resident_memory_bytes ${{process.memoryUsage().rss}}`);
+  lines.push("# TYPE process_uptime_seconds gauge", `process_uptime_seconds ${{process.uptime()}}`);{render_metrics_collectors()}
+  res.type("text/plain; version=0.0.4").send(lines.join("\\n") + "\\n");
+}};
+
+module.exports = {{ metricsMiddleware, metricsHandler, observeQuery }};
+'''
+
+def render_conditional_file():
+    if generator_options["row_counts"]:
+        imports = '\nconst { fn, col } = require("sequelize");\nconst { tableCount } = require("../utils/counts");'
+        list_validators = '''// Two lookups decide whether any list page of the table can have changed: MAX(updatedAt) moves on
+// inserts and updates, the row count on deletes. On its own, MAX(updatedAt) is one seek into the
+// updatedAt index, and the count is read from _counts, so neither scans the table. The URL hash keeps
+// pages and filters apart.
+const listValidators = async (Model, url) => {
+  const stamp = await Model.findOne({ attributes: [[fn("MAX", col("updatedAt")), "lastModified"]], raw: true });
+  const total = await tableCount(Model);
+  const version = stamp.lastModified ? new Date(stamp.lastModified).getTime() : 0;
+  const page = crypto.createHash("sha1").update(url).digest("base64url").slice(0, 12);
+  return { etag: `W/"${total}-${version}-${page}"`, lastModified: httpDate(stamp.lastModified) };
+};'''
+        exports = "recordValidators, listValidators, notModified"
+    else:
+        # Without _counts, deletes only show up in a COUNT(*) over the whole table, which is too much to
+        # pay on every list request just to set a header
+        imports = ""
+        list_validators = '''// A list page's ETag is a hash of each row's id and updatedAt plus the paging fields (next, total),
+// which change whenever the page's content does. It costs no query beyond the page being served and
+// never serializes the rows, so a 304 skips the whole JSON encoding. null when ?fields= left updatedAt
+// out. There is no Last-Modified: MAX(updatedAt) alone does not move when a row is deleted.
+const pageValidators = ({ data, ...paging }) => {
+  if (data.some((row) => row.updatedAt === undefined)) {
+    return null;
+  }
+  const hash = crypto.createHash("sha1");
+  for (const row of data) {
+    hash.update(`${row.id}:${new Date(row.updatedAt).getTime()},`);
+  }
+  hash.update(JSON.stringify(paging));
+  return { etag: `W/"${hash.digest("base64url")}"` };
+};'''
+        exports = "recordValidators, pageValidators, notModified"
+    return '''const crypto = require("crypto");''' + imports + '''
+
+const httpDate = (value) => (value ? new Date(value).toUTCString() : undefined);
+
+// Weak validators for a single record: id + updatedAt change on every write to the row
+const recordValidators = (row) => ({
+  etag: `W/"${row.id}-${new Date(row.updatedAt).getTime()}"`,
+  lastModified: httpDate(row.updatedAt)
+});
+
+''' + list_validators + '''
+
+// Sets ETag/Last-Modified and reports whether If-None-Match / If-Modified-Since already match them
+const notModified = (req, res, { etag, lastModified }) => {
+  res.set("ETag", etag);
+  if (lastModified) {
+    res.set("Last-Modified", lastModified);
+  }
+  return req.fresh;
+};
 
-def create_models_files(name, *args):
+module.exports = { ''' + exports + ''' };
+'''
+
+# Responses with ?include= carry rows of other tables, which neither the cache keys nor the ETags
+# track, so models with associations skip both whenever include is not empty
+def render_not_modified(validators, bypass=None):
+    condition = f"{bypass} && notModified(req, res, {validators})" if bypass else f"notModified(req, res, {validators})"
+    return f'''
+    if ({condition}) {{
+      return res.status(304).end();
+    }}'''
+
+# With --row-counts a list is checked before its page is queried (MAX(updatedAt) plus the _counts row);
+# otherwise the check runs on the finished page
+def render_list_not_modified(name, bypass=None):
+    if not generator_options["row_counts"]:
+        return ""
+    return render_not_modified(f"await listValidators({name}, req.url)", bypass)
+
+def render_page_not_modified(body, bypass=None):
+    if generator_options["row_counts"]:
+        return ""
+    # Rows of included associations are not in the hash, so a page with ?include= is always sent in full
+    condition = f"{bypass} && pageTag" if bypass else "pageTag"
+    return f'''
+    const pageTag = pageValidators({body});
+    if ({condition} && notModified(req, res, pageTag)) {{
+      return res.status(304).end();
+    }}'''
+
+def render_cache_lookup(key, bypass=None):
+    if not generator_options["cache"]:
+        return ""
+    if bypass:
+        return f'''
+    const cacheKey = {bypass} ? {key} : null;
+    const cached = cacheKey === null ? undefined : cache.get(cacheKey);
+    if (cached !== undefined) {{
+      return cache.reply(req, res, cached);
+    }}'''
+    return f'''
+    const cacheKey = {key};
+    const cached = cache.get(cacheKey);
+    if (cached !== undefined) {{
+      return cache.reply(req, res, cached);
+    }}'''
+
+def render_cached_response(body, bypass=None):
+    if not generator_options["cache"]:
+        return f"res.json({body});"
+    if bypass:
+        return f"cacheKey === null ? res.json({body}) : cache.send(res, cacheKey, {body});"
+    return f"cache.send(res, cacheKey, {body});"
+
+def include_bypass(model):
+    return "include.length === 0" if has_associations(model) else None
+
+def render_cache_invalidation(name, ids=None):
+    if not generator_options["cache"]:
+        return ""
+    return f'\n    cache.invalidate("{name}", {ids});' if ids else f'\n    cache.invalidate("{name}");'
+
+def render_write(expression):
+    return f"enqueueWrite((transaction) => {expression})" if generator_options["write_queue"] else expression
+
+def write_transaction():
+    return "enqueueWrite" if generator_options["write_queue"] else "sequelize.transaction"
+
+def render_create_handler(model):
+    name = model["name"]
+    transaction_option = ", { transaction }" if generator_options["write_queue"] else ""
+    return f'''exports.create{name} = async (req, res) => {{
+  const {{ value, errors }} = validateCreate(req.body);
+  if (errors) {{
+    return res.status(400).json(validationError(errors));
+  }}
+  try {{
+    const new{name} = await {render_write(f'{name}.create(value{transaction_option})')};{render_cache_invalidation(name)}
+    res.status(201).json(new{name});
+{render_error_handler(bool(model["belongsTo"]))}
+}};'''
+
+def render_list_query(model=None):
+    options = "columns, queryable, sortable, includable" if model and has_associations(model) else "columns, queryable, sortable"
+    return '''  let query;
+  try {
+    query = parseListQuery(req.query, { ''' + options + ''' });
+  } catch (err) {
+    return res.status(400).json({ error: err.message });
+  }'''
+
+def render_count(name):
+    return f"countRows({name}, where)" if generator_options["row_counts"] else f"{name}.count({{ where }})"
+
+def render_offset_page(model):
+    name = model["name"]
+    order = 'order: [[sort.field, sort.direction], ["id", sort.direction]]'
+    bypass = include_bypass(model)
+    # Includes are kept out of the count, which only ever needs the model's own table
+    if not generator_options["row_counts"] and not bypass:
+        return f'''const result = await {name}.findAndCountAll({{ where, attributes, limit, offset, {order} }});
+    const body = {{ data: result.rows, total: result.count, page, limit }};{render_page_not_modified("body")}
+    {render_cached_response("body")}'''
+    include = "include, " if bypass else ""
+    return f'''const rows = await {name}.findAll({{ where, attributes, {include}limit, offset, {order} }});
+    const total = await {render_count(name)};
+    const body = {{ data: rows, total, page, limit }};{render_page_not_modified("body", bypass)}
+    {render_cached_response("body", bypass)}'''
+
+def render_recount_handler(model):
+    name = model["name"]
+    return f'''exports.recount{name} = async (req, res) => {{
+  try {{
+    const total = await recount({name});{render_cache_invalidation(name)}
+    res.json({{ total }});
+{render_error_handler()}
+}};'''
+
+def render_counts_file():
+    writer_import = '\nconst { enqueueWrite } = require("./writer");' if generator_options["write_queue"] else ""
+    return f'''const {{ QueryTypes }} = require("sequelize");
+const {{ sequelize }} = require("../config/database");{writer_import}
+
+// Row count of a whole table from its _counts row, which triggers keep exact (see rowCounter in
+// utils/migrations.js). One primary-key lookup instead of a COUNT(*) that reads every row.
+const tableCount = async (Model) => {{
+  const [row] = await sequelize.query("SELECT count FROM _counts WHERE name = ?", {{
+    replacements: [Model.getTableName()],
+    type: QueryTypes.SELECT
+  }});
+  // No row until a migration has added the table's counter
+  return row ? row.count : Model.count();
+}};
+
+// Filtered totals still need COUNT(*); only the unfiltered total is kept
+const countRows = (Model, where) => (Object.keys(where).length === 0 ? tableCount(Model) : Model.count({{ where }}));
+
+// Exact COUNT(*) written back to _counts, to repair a count after rows changed while the triggers were missing
+const recount = (Model) =>
+  {write_transaction()}(async (transaction) => {{
+    const count = await Model.count({{ transaction }});
+    await sequelize.query("INSERT INTO _counts (name, count) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET count = excluded.count", {{
+      replacements: [Model.getTableName(), count],
+      transaction
+    }});
+    return count;
+  }});
+
+module.exports = {{ tableCount, countRows, recount }};
+'''
+
+def render_ids_dispatch(name):
+    return f'''
+  // ?ids=1,2,3 is a batch read, not a list page
+  if (req.query.ids !== undefined) {{
+    return exports.read{name}ByIds(req, res);
+  }}'''
+
+def render_read_by_ids_handler(model):
+    name = model["name"]
+    return f'''exports.read{name}ByIds = async (req, res) => {{
+  // GET /read?ids=1,2,3, or POST /read/batch with [1, 2, 3] or {{ "ids": [1, 2, 3] }} for lists too long for a URL
+  const ids = parseIds(req.method === "GET" ? req.query.ids : Array.isArray(req.body) ? req.body : req.body && req.body.ids);
+  if (!ids) {{
+    return res.status(400).json({{ error: `Expected 1 to ${{READ_BATCH_MAX}} integer ids` }});
+  }}
+  try {{
+    const data = await findByIds({name}, ids);
+    res.json({{ data, missing: ids.filter((id, index) => data[index] === null) }});
+{render_error_handler()}
+}};'''
+
+def render_list_handler(model):
+    name = model["name"]
+    bypass = include_bypass(model)
+    destructure = "{ where, sort, attributes, include }" if bypass else "{ where, sort, attributes }"
+    lookups = render_cache_lookup(f'cache.listKey("{name}", req.url)', bypass) + render_list_not_modified(name, bypass)
+    if generator_options["pagination"] == "offset":
+        return f'''exports.read{name} = async (req, res) => {{{render_ids_dispatch(name)}
+  const page = parseInt(req.query.page) || 0;
+  const limit = parseInt(req.query.limit) || 25;
+  const offset = page * limit;
+{render_list_query(model)}
+  const {destructure} = query;
+  try {{{lookups}
+    {render_offset_page(model)}
+{render_error_handler()}
+}};'''
+    include = "\n      include," if bypass else ""
+    return f'''exports.read{name} = async (req, res) => {{{render_ids_dispatch(name)}
+  const limit = parseInt(req.query.limit) || 25;
+{render_list_query(model)}
+  const {destructure} = query;
+  const cursor = decodeCursor(req.query.cursor, sort.field);
+  if (cursor === undefined) {{
+    return res.status(400).json({{ error: "Invalid cursor" }});
+  }}
+  try {{{lookups}
+    // One extra row tells us whether another page exists without a COUNT(*)
+    const rows = await {name}.findAll({{
+      where: {{ [Op.and]: [where, keysetWhere(cursor, sort.field, sort.direction)] }},
+      attributes,{include}
+      order: keysetOrder(sort.field, sort.direction),
+      limit: limit + 1
+    }});
+    const data = rows.slice(0, limit);
+    const next = rows.length > limit ? encodeCursor(data[data.length - 1], sort.field) : null;
+    const body = {{ data, next, limit }};
+    if (req.query.count === "true") {{
+      body.total = await {render_count(name)};
+    }}{render_page_not_modified("body", bypass)}
+    {render_cached_response("body", bypass)}
+{render_error_handler()}
+}};'''
+
+def render_read_handler(model):
+    name = model["name"]
+    bypass = include_bypass(model)
+    if not bypass:
+        return f'''exports.read{name}FromID = async (req, res) => {{
+  try {{{render_cache_lookup(f'cache.key("{name}", req.params.id)')}
+    const result = await {name}.findByPk(req.params.id);
+    if (!result) {{
+      return res.status(404).json({{ error: "Record not found" }});
+    }}{render_not_modified("recordValidators(result)")}
+    {render_cached_response("result")}
+{render_error_handler()}
+}};'''
+    return f'''exports.read{name}FromID = async (req, res) => {{
+  let include;
+  try {{
+    include = parseInclude(req.query.include, includable);
+  }} catch (err) {{
+    return res.status(400).json({{ error: err.message }});
+  }}
+  try {{{render_cache_lookup(f'cache.key("{name}", req.params.id)', bypass)}
+    const result = await {name}.findByPk(req.params.id, {{ include }});
+    if (!result) {{
+      return res.status(404).json({{ error: "Record not found" }});
+    }}{render_not_modified("recordValidators(result)", bypass)}
+    {render_cached_response("result", bypass)}
+{render_error_handler()}
+}};'''
+
+def render_write_options(model):
+    options = (["version"] if model["version"] else []) + (["transaction"] if generator_options["write_queue"] else [])
+    return f", {{ {', '.join(options)} }}" if options else ""
+
+def render_expected_version(model, source):
+    if not model["version"]:
+        return ""
+    return f'''
+  // Optimistic locking: send the version you read and the write only happens if nobody changed the row since
+  const version = {source} === undefined ? undefined : Number({source});
+  if (version !== undefined && !Number.isInteger(version)) {{
+    return res.status(400).json({{ error: "version must be an integer" }});
+  }}'''
+
+def render_version_conflict(model):
+    if not model["version"]:
+        return ""
+    name = model["name"]
+    return f'''
+      const current = version === undefined ? null : await {name}.findByPk(req.params.id);
+      if (current) {{
+        return res.status(409).json({{ error: "Version conflict: the record changed since you read it", current }});
+      }}'''
+
+def render_update_handler(model):
+    name = model["name"]
+    return f'''exports.update{name} = async (req, res) => {{
+  // PATCH semantics for both PUT and PATCH: only the fields in the body are written
+  const {{ value: patch, errors }} = validateUpdate(req.body);
+  if (errors) {{
+    return res.status(400).json(validationError(errors));
+  }}
+  if (Object.keys(patch).length === 0) {{
+    return res.status(400).json({{ error: "Send at least one field to update" }});
+  }}{render_expected_version(model, "req.body.version")}
+  try {{
+    const result = await {render_write(f"updateReturning({name}, req.params.id, patch{render_write_options(model)})")};
+    if (!result) {{{render_version_conflict(model)}
+      return res.status(404).json({{ error: "Record not found" }});
+    }}{render_cache_invalidation(name, "[req.params.id]")}
+    res.json(result);
+{render_error_handler(bool(model["belongsTo"]))}
+}};'''
+
+def render_delete_handler(model, dependents=()):
+    name = model["name"]
+    transaction_option = ", transaction" if generator_options["write_queue"] else ""
+    where = "{ id: req.params.id, ...(version !== undefined && { version }) }" if model["version"] else "{ id: req.params.id }"
+    return f'''exports.delete{name} = async (req, res) => {{{render_expected_version(model, "req.query.version")}
+  try {{
+    const deleted = await {render_write(f'{name}.destroy({{ where: {where}{transaction_option} }})')};
+    if (deleted === 0) {{{render_version_conflict(model)}
+      return res.status(404).json({{ error: "Record not found" }});
+    }}{render_cache_invalidation(name, "[req.params.id]")}
+    res.json({{ message: "Record deleted successfully" }});
+{render_error_handler(bool(dependents))}
+}};'''
+
+def render_bulk_create_handler(model):
+    name = model["name"]
+    return f'''exports.bulkCreate{name} = async (req, res) => {{
+  if (!Array.isArray(req.body) || req.body.length === 0) {{
+    return res.status(400).json({{ error: "Expected a non-empty array of records" }});
+  }}
+  try {{
+    const results = new Array(req.body.length);
+    const valid = [];
+    for (const [index, item] of req.body.entries()) {{
+      const {{ value, errors }} = validateCreate(item);
+      if (errors) {{
+        results[index] = {{ index, status: 400, ...validationError(errors) }};
+      }} else {{
+        valid.push({{ index, record: value }});
+      }}
+    }}
+    // Valid rows are inserted in chunks inside one transaction: one commit instead of one per row. writeRows
+    // retries a chunk that a constraint rejects row by row, so only the conflicting rows fail.
+    await {write_transaction()}(async (transaction) => {{
+      for (const batch of chunk(valid, BULK_CHUNK_SIZE)) {{
+        await writeRows(sequelize, transaction, batch, async (entries, savepoint) => {{
+          const created = await {name}.bulkCreate(entries.map((entry) => entry.record), {{ transaction: savepoint, validate: false }});
+          created.forEach((row, i) => {{
+            results[entries[i].index] = {{ index: entries[i].index, status: 201, id: row.id }};
+          }});
+        }}, (entry, failure) => {{
+          results[entry.index] = {{ index: entry.index, ...failure }};
+        }});
+      }}
+    }});{render_cache_invalidation(name)}
+    res.json(bulkResponse(results));
+{render_error_handler(bool(model["belongsTo"]))}
+}};'''
+
+def render_bulk_update_handler(model):
+    name = model["name"]
+    bulk_patch = '{ ...patch, version: sequelize.literal("version + 1") }' if model["version"] else "patch"
+    return f'''exports.bulkUpdate{name} = async (req, res) => {{
+  if (!Array.isArray(req.body) || req.body.length === 0) {{
+    return res.status(400).json({{ error: "Expected a non-empty array of records with ids" }});
+  }}
+  try {{
+    const results = new Array(req.body.length);
+    // Items that set the same values share one UPDATE ... WHERE id IN (...)
+    const groups = new Map();
+    for (const [index, item] of req.body.entries()) {{
+      const id = Number(item && item.id);
+      const {{ value: patch, errors }} = validateUpdate(item);
+      if (!Number.isInteger(id) || (!errors && Object.keys(patch).length === 0)) {{
+        results[index] = {{ index, status: 400, error: "Each update needs an id and at least one field" }};
+        continue;
+      }}
+      if (errors) {{
+        results[index] = {{ index, status: 400, id, ...validationError(errors) }};
+        continue;
+      }}
+      const key = JSON.stringify(patch);
+      if (!groups.has(key)) {{
+        groups.set(key, {{ patch, entries: [] }});
+      }}
+      groups.get(key).entries.push({{ index, id }});
+    }}
+    await {write_transaction()}(async (transaction) => {{
+      for (const {{ patch, entries }} of groups.values()) {{
+        for (const batch of chunk(entries, BULK_CHUNK_SIZE)) {{
+          await writeRows(sequelize, transaction, batch, async (part, savepoint) => {{
+            const existing = await existingIds({name}, part.map((entry) => entry.id), savepoint);
+            await {name}.update({bulk_patch}, {{ where: {{ id: {{ [Op.in]: [...existing] }} }}, transaction: savepoint }});
+            part.forEach(({{ index, id }}) => {{
+              results[index] = existing.has(id) ? {{ index, status: 200, id }} : {{ index, status: 404, id, error: "Record not found" }};
+            }});
+          }}, ({{ index, id }}, failure) => {{
+            results[index] = {{ index, id, ...failure }};
+          }});
+        }}
+      }}
+    }});{render_cache_invalidation(name, "results.filter((result) => result.status === 200).map((result) => result.id)")}
+    res.json(bulkResponse(results));
+{render_error_handler(bool(model["belongsTo"]))}
+}};'''
+
+def render_bulk_delete_handler(model, dependents=()):
+    name = model["name"]
+    return f'''exports.bulkDelete{name} = async (req, res) => {{
+  const ids = Array.isArray(req.body) ? req.body : req.body && req.body.ids;
+  if (!Array.isArray(ids) || ids.length === 0) {{
+    return res.status(400).json({{ error: "Expected a non-empty array of ids" }});
+  }}
+  try {{
+    const results = ids.map((id, index) => ({{ index, id: Number(id) }}));
+    const valid = results.filter((result) => Number.isInteger(result.id));
+    await {write_transaction()}(async (transaction) => {{
+      for (const batch of chunk(valid, BULK_CHUNK_SIZE)) {{
+        await writeRows(sequelize, transaction, batch, async (part, savepoint) => {{
+          const existing = await existingIds({name}, part.map((result) => result.id), savepoint);
+          await {name}.destroy({{ where: {{ id: {{ [Op.in]: [...existing] }} }}, transaction: savepoint }});
+          part.forEach((result) => {{
+            Object.assign(result, existing.has(result.id) ? {{ status: 200 }} : {{ status: 404, error: "Record not found" }});
+          }});
+        }}, (result, failure) => {{
+          Object.assign(result, failure);
+        }});
+      }}
+    }});
+    results.filter((result) => !result.status).forEach((result) => {{
+      Object.assign(result, {{ id: ids[result.index], status: 400, error: "Invalid id" }});
+    }});{render_cache_invalidation(name, "results.filter((result) => result.status === 200).map((result) => result.id)")}
+    res.json(bulkResponse(results));
+{render_error_handler(bool(dependents))}
+}};'''
+
+def render_bulk_file():
+    return f'''const {{ Op }} = require("sequelize");
+
+// Rows per INSERT/UPDATE/DELETE statement inside a bulk transaction; at least 1 so chunk() always advances
+const BULK_CHUNK_SIZE = Math.max(parseInt(process.env.BULK_CHUNK_SIZE) || {generator_options["bulk_chunk_size"]}, 1);
+
+const chunk = (items, size) => {{
+  const chunks = [];
+  for (let i = 0; i < items.length; i += size) {{
+    chunks.push(items.slice(i, i + size));
+  }}
+  return chunks;
+}};
+
+// Most ids one batch read accepts; each BULK_CHUNK_SIZE of them is one SELECT
+const READ_BATCH_MAX = parseInt(process.env.READ_BATCH_MAX) || 1000;
+
+// "1,2,3" or [1, 2, 3] as integers, or null when any id is not an integer or there are none or too many
+const parseIds = (value) => {{
+  const items = Array.isArray(value) ? value : typeof value === "string" && value !== "" ? value.split(",") : [];
+  const ids = items.map((item) => (typeof item === "number" || (typeof item === "string" && /^\\s*-?\\d+\\s*$/.test(item)) ? Number(item) : NaN));
+  if (ids.length === 0 || ids.length > READ_BATCH_MAX || !ids.every(Number.isInteger)) {{
+    return null;
+  }}
+  return ids;
+}};
+
+// One row per requested id, in request order, with null where the id does not exist. Duplicates are
+// fetched once, and each chunk is a single WHERE id IN (...) that stays under SQLite's variable limit.
+const findByIds = async (Model, ids) => {{
+  const found = new Map();
+  for (const batch of chunk([...new Set(ids)], BULK_CHUNK_SIZE)) {{
+    const rows = await Model.findAll({{ where: {{ id: {{ [Op.in]: batch }} }} }});
+    rows.forEach((row) => found.set(row.id, row));
+  }}
+  return ids.map((id) => found.get(id) || null);
+}};
+
+const existingIds = async (Model, ids, transaction) => {{
+  const rows = await Model.findAll({{ attributes: ["id"], where: {{ id: {{ [Op.in]: ids }} }}, transaction, raw: true }});
+  return new Set(rows.map((row) => row.id));
+}};
+
+// What one row did wrong when the database rejected it: 409 for unique and foreign-key conflicts, 400 for
+// other constraints (NOT NULL, CHECK). null means the error is not the row's fault and fails the request.
+const rowFailure = (err) => {{
+  const detail = err.errors && err.errors.length > 0 ? err.errors.map((entry) => entry.message).join("; ") : err.message;
+  if (err.name === "SequelizeUniqueConstraintError" || err.name === "SequelizeForeignKeyConstraintError") {{
+    return {{ status: 409, error: detail }};
+  }}
+  if (err.name === "SequelizeValidationError" || /SQLITE_CONSTRAINT/.test(err.message)) {{
+    return {{ status: 400, error: detail }};
+  }}
+  return null;
+}};
+
+// Runs write(entries, savepoint) for a whole chunk in one savepoint. When the database rejects the chunk for a
+// reason a single row can cause, the savepoint is rolled back and the entries are retried one at a time, each
+// in its own savepoint: rows that still fail go to onFailure(entry, {{ status, error }}), the rest are written.
+const writeRows = async (sequelize, transaction, entries, write, onFailure) => {{
+  const attempt = (part) => sequelize.transaction({{ transaction }}, (savepoint) => write(part, savepoint));
+  try {{
+    await attempt(entries);
+    return;
+  }} catch (err) {{
+    const failure = rowFailure(err);
+    if (!failure) {{
+      throw err;
+    }}
+    if (entries.length === 1) {{
+      return onFailure(entries[0], failure);
+    }}
+  }}
+  for (const entry of entries) {{
+    try {{
+      await attempt([entry]);
+    }} catch (err) {{
+      const failure = rowFailure(err);
+      if (!failure) {{
+        throw err;
+      }}
+      onFailure(entry, failure);
+    }}
+  }}
+}};
+
+const bulkResponse = (results) => ({{
+  results,
+  succeeded: results.filter((result) => result.status < 300).length,
+  failed: results.filter((result) => result.status >= 300).length
+}});
+
+module.exports = {{ BULK_CHUNK_SIZE, READ_BATCH_MAX, chunk, parseIds, findByIds, existingIds, rowFailure, writeRows, bulkResponse }};
+'''
+
+def render_validation_file():
+    return '''// Value checks shared by the generated validators/<Model>.js files. They accept what the model validators
+// accept (numbers may arrive as numeric strings), so a payload that passes here also passes Sequelize.
+const INT = /^[-+]?(?:0|[1-9][0-9]*)$/;
+const FLOAT = /^[-+]?(?:[0-9]+(?:\\.[0-9]*)?|\\.[0-9]+)(?:[eE][-+]?[0-9]+)?$/;
+const DECIMAL = /^[-+]?(?:[0-9]+(?:\\.[0-9]+)?|\\.[0-9]+)$/;
+const UUID = /^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$/i;
+
+const isObject = (value) => value !== null && typeof value === "object" && !Array.isArray(value);
+const isBlank = (value) => /^\\s*$/.test(value);
+const isInt = (value) => (typeof value === "number" ? Number.isInteger(value) : typeof value === "string" && INT.test(value));
+const isFloat = (value) => (typeof value === "number" ? Number.isFinite(value) : typeof value === "string" && FLOAT.test(value));
+const isDecimal = (value) => (typeof value === "number" ? Number.isFinite(value) : typeof value === "string" && DECIMAL.test(value));
+const isDate = (value) => (typeof value === "string" || typeof value === "number") && !Number.isNaN(new Date(value).getTime());
+const isUUID = (value) => typeof value === "string" && UUID.test(value);
+// Sequelize's BOOLEAN takes "true"/"false" and 1/0 as well; "1"/"0" are what CSV files and forms send
+const BOOLEANS = new Map([[true, true], [false, false], ["true", true], ["false", false], ["1", true], ["0", false], [1, true], [0, false]]);
+const booleanKey = (value) => (typeof value === "string" ? value.trim().toLowerCase() : value);
+const isBoolean = (value) => BOOLEANS.has(booleanKey(value));
+const toBoolean = (value) => BOOLEANS.get(booleanKey(value));
+
+// Every failing field in one response; error keeps the single-string shape older clients read
+const validationError = (errors) => ({
+  error: errors.map((entry) => entry.message).join("; "),
+  errors
+});
+
+module.exports = { isObject, isBlank, isInt, isFloat, isDecimal, isDate, isUUID, isBoolean, toBoolean, validationError };
+'''
+
+def render_field_check(field, operation):
+    name = field["name"]
+    source = f"body.{name}"
+    check, message = field_checks[field["type"]]
+    # Creates need every required field; updates only check what was sent, but may not null a required field
+    skip_missing = field["optional"] or operation == "update"
+    if field["optional"]:
+        branches = [(f"{source} === null", f"value.{name} = null;")]
+    elif operation == "create":
+        branches = [(f"{source} === undefined || {source} === null", f'errors.push({{ field: "{name}", message: "{name} is required" }});')]
+    else:
+        branches = [(f"{source} === null", f'errors.push({{ field: "{name}", message: "{name} cannot be null" }});')]
+    if check:
+        condition = check.format(value=source)
+        branches.append((f"!({condition})" if " " in condition else f"!{condition}", f'errors.push({{ field: "{name}", message: "{message.format(name=name)}" }});'))
+    indent = "    " if skip_missing else "  "
+    chain = " else ".join(f"if ({condition}) {{\n{indent}  {action}\n{indent}}}" for condition, action in branches)
+    converted = field_conversions.get(field["type"], "{value}").format(value=source)
+    chain += f" else {{\n{indent}  value.{name} = {converted};\n{indent}}}"
+    if skip_missing:
+        return f"  if ({source} !== undefined) {{\n    {chain}\n  }}"
+    return f"  {chain}"
+
+def render_validator_function(model, operation):
+    checks = "\n".join(render_field_check(field, operation) for field in model["fields"])
+    return f'''const validate{operation.capitalize()} = (body) => {{
+  if (!isObject(body)) {{
+    return {{ errors: [{{ field: null, message: "Expected a JSON object" }}] }};
+  }}
+  const value = {{}};
+  const errors = [];
+{checks}
+  return errors.length > 0 ? {{ errors }} : {{ value }};
+}};'''
+
+def render_validators_file(model):
+    name = model["name"]
+    expressions = [(field_checks[field["type"]][0] or "") + field_conversions.get(field["type"], "") for field in model["fields"]]
+    used = [helper for helper in ["isBlank", "isInt", "isFloat", "isDecimal", "isDate", "isUUID", "isBoolean", "toBoolean"] if any(helper + "(" in expression for expression in expressions)]
+    return f'''const {{ {", ".join(["isObject"] + used)} }} = require("../utils/validation");
+
+// Compiled from the {name} field list, so each request costs a few inline checks instead of building a model
+// instance. Only declared fields are copied into value; every failing field is reported, not just the first.
+{render_validator_function(model, "create")}
+
+{render_validator_function(model, "update")}
+
+module.exports = {{ validateCreate, validateUpdate }};
+'''
+
+def render_validation_bench_file(models):
+    cases = []
+    for model in models:
+        name = model["name"]
+        # "" fails every typed check; json fields have none and are left out, so a required one is reported missing
+        payload = ", ".join(f'{field["name"]}: ""' for field in model["fields"] if field_checks[field["type"]][0])
+        cases.append(f'  {{ name: "{name}", Model: require("../models/{name}"), validateCreate: require("../validators/{name}").validateCreate, payload: {{ {payload} }} }},')
+    cases = "\n".join(cases)
+    return f'''// Throughput on rejected payloads: the compiled validators against building a model instance and running its
+// validators, which is what every create, update and bulk item cost before. Run it with npm run bench:validation.
+const {{ performance }} = require("perf_hooks");
+
+const ITERATIONS = parseInt(process.env.BENCH_ITERATIONS) || 20000;
+
+const cases = [
+{cases}
+];
+
+const perSecond = (started) => Math.round(ITERATIONS / ((performance.now() - started) / 1000));
+
+const run = async () => {{
+  console.log(`Rejected payloads per second, ${{ITERATIONS}} per model`);
+  for (const {{ name, Model, validateCreate, payload }} of cases) {{
+    let rejected = 0;
+    let started = performance.now();
+    for (let i = 0; i < ITERATIONS; i++) {{
+      rejected += validateCreate(payload).errors ? 1 : 0;
+    }}
+    const compiled = perSecond(started);
+    started = performance.now();
+    for (let i = 0; i < ITERATIONS; i++) {{
+      rejected += await Model.build(payload).validate().then(() => 0, () => 1);
+    }}
+    const orm = perSecond(started);
+    console.log(`${{name}}: compiled ${{compiled}}/s, model.validate() ${{orm}}/s (${{(compiled / orm).toFixed(1)}}x, ${{rejected}} of ${{ITERATIONS * 2}} rejected)`);
+  }}
+}};
+
+run().then(() => process.exit(0), (err) => {{
+  console.error(err);
+  process.exit(1);
+}});
+'''
+
+def render_records_file():
+    return '''const { QueryTypes } = require("sequelize");
+
+// UPDATE ... RETURNING * writes only the columns in patch and returns the updated row from the same
+// statement, where Model.update() + findByPk() costs two. Resolves to null when no row matched, which
+// for versioned models also covers a stale expected version.
+const updateReturning = async (Model, id, patch, { version, transaction } = {}) => {
+  const { sequelize } = Model;
+  const values = { ...patch, updatedAt: new Date() };
+  const where = { id };
+  if (Model.rawAttributes.version) {
+    values.version = sequelize.literal("version + 1");
+    if (version !== undefined) {
+      where.version = version;
+    }
+  }
+  // The query generator formats each value for its column type (JSON, booleans, dates) as bind parameters
+  const { query, bind } = sequelize.getQueryInterface().queryGenerator.updateQuery(Model.getTableName(), values, where, {}, Model.rawAttributes);
+  const [row] = await sequelize.query(`${query.replace(/;\\s*$/, "")} RETURNING *`, {
+    bind,
+    transaction,
+    type: QueryTypes.SELECT,
+    model: Model,
+    mapToModel: true
+  });
+  return row || null;
+};
+
+module.exports = { updateReturning };
+'''
+
+def render_export_handler(model):
+    name = model["name"]
+    table = table_name(name)
+    return f'''exports.export{name} = async (req, res) => {{
+  const format = req.query.format === "csv" ? "csv" : "ndjson";
+  let closed = false;
+  res.on("close", () => {{
+    closed = true;
+  }});
+  try {{
+    res.type(format === "csv" ? "text/csv" : "application/x-ndjson");
+    res.setHeader("Content-Disposition", `attachment; filename="{table}.${{format}}"`);
+    if (format === "csv") {{
+      await writeChunk(res, csvRow(columns));
+    }}
+    // Seek on the primary key instead of OFFSET so every chunk is an index range scan
+    let lastId = 0;
+    while (!closed) {{
+      const rows = await {name}.findAll({{ where: {{ id: {{ [Op.gt]: lastId }} }}, order: [["id", "ASC"]], limit: EXPORT_CHUNK_SIZE, raw: true }});
+      if (rows.length === 0) {{
+        break;
+      }}
+      lastId = rows[rows.length - 1].id;
+      const lines = rows.map((row) => (format === "csv" ? csvRow(columns.map((column) => row[column])) : JSON.stringify(row) + "\\n"));
+      await writeChunk(res, lines.join(""));
+    }}
+    res.end();
+  }} catch (err) {{
+    console.log(err);
+    if (res.headersSent) {{
+      return res.destroy(err);
+    }}
+    res.status(500).json({{ error: err.message }});
+  }}
+}};'''
+
+def render_csv_json(model):
+    json_fields = [field["name"] for field in model["fields"] if field["type"] == "json"]
+    if not json_fields:
+        return ""
+    assignments = "\n".join(f"        record.{name} = csvJson(record.{name});" for name in json_fields)
+    return f'''
+      if (format === "csv") {{
+{assignments}
+      }}'''
+
+def render_import_handler(model):
+    name = model["name"]
+    return f'''exports.import{name} = async (req, res) => {{
+  if (req.is("application/json")) {{
+    return res.status(415).json({{ error: "Send NDJSON (application/x-ndjson) or CSV (text/csv)" }});
+  }}
+  const format = req.query.format || (req.is("text/csv") ? "csv" : "ndjson");
+  const records = format === "csv" ? csvRecords(req) : ndjsonRecords(req);
+  const summary = {{ accepted: 0, rejected: 0, errors: [] }};
+  const reject = (line, error) => {{
+    summary.rejected += 1;
+    if (summary.errors.length < IMPORT_ERROR_LIMIT) {{
+      summary.errors.push({{ line, error }});
+    }}
+  }};
+  let batch = [];
+  // Each batch is one transaction and one fsync; reading pauses while it commits. writeRows retries a
+  // batch that a constraint rejects row by row, so only the conflicting lines are rejected.
+  const flush = async () => {{
+    const entries = batch;
+    batch = [];
+    await {write_transaction()}((transaction) =>
+      writeRows(sequelize, transaction, entries, async (part, savepoint) => {{
+        await {name}.bulkCreate(part.map((entry) => entry.record), {{ transaction: savepoint, validate: false }});
+        summary.accepted += part.length;
+      }}, (entry, failure) => reject(entry.line, failure.error))
+    );{render_cache_invalidation(name)}
+  }};
+  try {{
+    for await (const {{ line, record, error }} of records) {{
+      if (error) {{
+        reject(line, error);
+        continue;
+      }}{render_csv_json(model)}
+      const {{ value, errors }} = validateCreate(record);
+      if (errors) {{
+        reject(line, validationError(errors).error);
+        continue;
+      }}
+      batch.push({{ line, record: value }});
+      if (batch.length >= IMPORT_BATCH_SIZE) {{
+        await flush();
+      }}
+    }}
+    if (batch.length > 0) {{
+      await flush();
+    }}
+    res.json(summary);
+  }} catch (err) {{
+    console.log(err);
+    res.status(500).json({{ error: err.message, ...summary }});
+  }}
+}};'''
+
+def render_search_handler(model):
+    name = model["name"]
+    table = table_name(name)
+    fts = f"{table}_fts"
+    return f'''exports.search{name} = async (req, res) => {{
+  const limit = parseInt(req.query.limit) || 25;
+  const match = searchQuery(req.query.q);
+  if (!match) {{
+    return res.status(400).json({{ error: "Provide search terms with ?q=" }});
+  }}
+  const cursor = decodeCursor(req.query.cursor, "rank");
+  if (cursor === undefined) {{
+    return res.status(400).json({{ error: "Invalid cursor" }});
+  }}
+  try {{{render_cache_lookup(f'cache.listKey("{name}", req.url)')}{render_list_not_modified(name)}
+    // bm25 ranks better matches lower; id breaks ties so a page boundary never splits equal scores
+    const after = cursor ? "AND ({fts}.rank > :rank OR ({fts}.rank = :rank AND {table}.id > :id))" : "";
+    const rows = await sequelize.query(
+      `SELECT {table}.*, {fts}.rank AS rank FROM {fts} JOIN {table} ON {table}.id = {fts}.rowid WHERE {fts} MATCH :match ${{after}} ORDER BY {fts}.rank, {table}.id LIMIT :limit`,
+      {{ replacements: {{ match, rank: cursor && cursor.value, id: cursor && cursor.id, limit: limit + 1 }}, model: {name}, mapToModel: true }}
+    );
+    const data = rows.slice(0, limit);
+    const last = data[data.length - 1];
+    const next = rows.length > limit ? encodeCursor({{ id: last.id, rank: last.get("rank") }}, "rank") : null;
+    const body = {{ data, next, limit }};{render_page_not_modified("body")}
+    {render_cached_response("body")}
+{render_error_handler()}
+}};'''
+
+def render_search_file():
+    return '''// Free text -> FTS5 query. Every word must match; words are quoted so user input can never be read as
+// MATCH syntax, and a trailing * keeps prefix search ("appl*" finds "apple").
+const searchQuery = (q) => {
+  if (typeof q !== "string") return "";
+  const terms = q.match(/[\\p{L}\\p{N}_]+\\*?/gu) || [];
+  return terms.map((term) => (term.endsWith("*") ? `"${term.slice(0, -1)}"*` : `"${term}"`)).join(" ");
+};
+
+module.exports = { searchQuery };
+'''
+
+def render_migrations_file():
+    return '''const fs = require("fs");
+const path = require("path");
+const { DataTypes, QueryTypes } = require("sequelize");
+
+const MIGRATIONS_DIR = path.join(__dirname, "../migrations");
+
+// Migration files start with a UTC timestamp, so name order is the order they were generated in
+const migrationNames = () =>
+  fs.existsSync(MIGRATIONS_DIR) ? fs.readdirSync(MIGRATIONS_DIR).filter((file) => file.endsWith(".js")).sort() : [];
+
+// External-content FTS5 index over table's searchable columns: the text is stored once, in the table
+// itself, and the triggers keep the index in step with every insert, update and delete
+const searchIndexStatements = (table, columns) => {
+  const fts = `${table}_fts`;
+  const list = columns.join(", ");
+  const values = (row) => columns.map((column) => `${row}.${column}`).join(", ");
+  const remove = `INSERT INTO ${fts}(${fts}, rowid, ${list}) VALUES ('delete', old.id, ${values("old")});`;
+  const add = `INSERT INTO ${fts}(rowid, ${list}) VALUES (new.id, ${values("new")});`;
+  return {
+    create: `CREATE VIRTUAL TABLE ${fts} USING fts5(${list}, content='${table}', content_rowid='id')`,
+    triggers: {
+      [`${fts}_insert`]: `AFTER INSERT ON ${table} BEGIN ${add} END`,
+      [`${fts}_delete`]: `AFTER DELETE ON ${table} BEGIN ${remove} END`,
+      // Updates that leave the searchable columns alone do not touch the index
+      [`${fts}_update`]: `AFTER UPDATE OF ${list} ON ${table} BEGIN ${remove} ${add} END`
+    }
+  };
+};
+
+// Helpers handed to every migration, already bound to its transaction
+const migrationContext = (sequelize, transaction) => {
+  const run = (sql, options = {}) => sequelize.query(sql, { transaction, ...options });
+  const dropSearchIndex = async (table) => {
+    for (const suffix of ["insert", "delete", "update"]) {
+      await run(`DROP TRIGGER IF EXISTS ${table}_fts_${suffix}`);
+    }
+    await run(`DROP TABLE IF EXISTS ${table}_fts`);
+  };
+  return {
+    queryInterface: sequelize.getQueryInterface(),
+    DataTypes,
+    transaction,
+    // IF NOT EXISTS keeps migrations safe to apply to a database that sequelize.sync() created
+    createIndex: (name, table, fields, { unique = false } = {}) =>
+      run(`CREATE ${unique ? "UNIQUE " : ""}INDEX IF NOT EXISTS \\`${name}\\` ON \\`${table}\\` (${fields.map((field) => `\\`${field}\\``).join(", ")})`),
+    dropIndex: (name) => run(`DROP INDEX IF EXISTS \\`${name}\\``),
+    // (Re)builds the index unless it already covers exactly these columns and all three triggers exist.
+    // Rebuilding a table (changeColumn/removeColumn) drops its triggers, so this runs after every rebuild.
+    searchIndex: async (table, columns) => {
+      const { create, triggers } = searchIndexStatements(table, columns);
+      const existing = await run("SELECT name, sql FROM sqlite_master WHERE name = ? OR tbl_name = ?", {
+        replacements: [`${table}_fts`, table],
+        type: QueryTypes.SELECT
+      });
+      const sql = new Map(existing.map((row) => [row.name, row.sql]));
+      if (sql.get(`${table}_fts`) === create && Object.keys(triggers).every((trigger) => sql.has(trigger))) {
+        return;
+      }
+      await dropSearchIndex(table);
+      await run(create);
+      for (const [trigger, body] of Object.entries(triggers)) {
+        await run(`CREATE TRIGGER ${trigger} ${body}`);
+      }
+      await run(`INSERT INTO ${table}_fts(${table}_fts) VALUES ('rebuild')`);
+    },
+    dropSearchIndex,
+    // _counts holds one row per table, kept exact by an insert and a delete trigger that run in the same
+    // transaction as the write. The count is reseeded from COUNT(*) here, which also covers rows written
+    // while a rebuilt table had no triggers.
+    rowCounter: async (table) => {
+      await run("CREATE TABLE IF NOT EXISTS _counts (name TEXT PRIMARY KEY, count INTEGER NOT NULL)");
+      await run(`INSERT INTO _counts (name, count) SELECT '${table}', COUNT(*) FROM \\`${table}\\` WHERE true ON CONFLICT (name) DO UPDATE SET count = excluded.count`);
+      await run(`CREATE TRIGGER IF NOT EXISTS ${table}_count_insert AFTER INSERT ON \\`${table}\\` BEGIN UPDATE _counts SET count = count + 1 WHERE name = '${table}'; END`);
+      await run(`CREATE TRIGGER IF NOT EXISTS ${table}_count_delete AFTER DELETE ON \\`${table}\\` BEGIN UPDATE _counts SET count = count - 1 WHERE name = '${table}'; END`);
+    },
+    dropRowCounter: async (table) => {
+      await run(`DROP TRIGGER IF EXISTS ${table}_count_insert`);
+      await run(`DROP TRIGGER IF EXISTS ${table}_count_delete`);
+      await run("DELETE FROM _counts WHERE name = ?", { replacements: [table] });
+    }
+  };
+};
+
+const currentVersion = async (sequelize) => {
+  try {
+    const [row] = await sequelize.query("SELECT version FROM _schema_version WHERE id = 1", { type: QueryTypes.SELECT });
+    return row ? row.version : null;
+  } catch (err) {
+    // No _schema_version table yet: nothing has been migrated
+    return null;
+  }
+};
+
+// Boot path: one SELECT of the version row. Only when it is behind the newest migration file are the
+// applied migrations read and the missing ones run, each in its own transaction together with its bookkeeping.
+// Bookkeeping for an applied migration, committed together with its changes
+const recordMigration = async (sequelize, name, transaction) => {
+  await sequelize.query("INSERT INTO _migrations (name, appliedAt) VALUES (?, ?)", { replacements: [name, new Date().toISOString()], transaction });
+  await sequelize.query("INSERT INTO _schema_version (id, version) VALUES (1, ?) ON CONFLICT (id) DO UPDATE SET version = excluded.version", {
+    replacements: [name],
+    transaction
+  });
+};
+
+// SQLite rebuilds a table for changeColumn/removeColumn by dropping it, which fails while rows of another
+// table reference it. Foreign keys can only be switched off outside a transaction and only per connection,
+// and sequelize.transaction() opens a fresh connection with them back on. So these migrations run on the
+// default connection with an explicit BEGIN/COMMIT, in SQLite's documented order: foreign keys off, BEGIN,
+// the changes, PRAGMA foreign_key_check, COMMIT, foreign keys on.
+const applyRebuild = async (sequelize, name, migration) => {
+  await sequelize.query("PRAGMA foreign_keys = OFF");
+  try {
+    await sequelize.query("BEGIN IMMEDIATE");
+    try {
+      await migration.up(migrationContext(sequelize, null));
+      const violations = await sequelize.query("PRAGMA foreign_key_check", { type: QueryTypes.SELECT });
+      if (violations.length > 0) {
+        throw new Error(`${name} leaves ${violations.length} rows pointing at missing records (first in ${violations[0].table})`);
+      }
+      await recordMigration(sequelize, name, null);
+      await sequelize.query("COMMIT");
+    } catch (error) {
+      await sequelize.query("ROLLBACK");
+      throw error;
+    }
+  } finally {
+    await sequelize.query("PRAGMA foreign_keys = ON");
+  }
+};
+
+const migrate = async (sequelize) => {
+  const names = migrationNames();
+  const latest = names.length > 0 ? names[names.length - 1] : null;
+  const version = await currentVersion(sequelize);
+  if (version === latest) {
+    return { version, applied: [] };
+  }
+  await sequelize.query("CREATE TABLE IF NOT EXISTS _migrations (name TEXT PRIMARY KEY, appliedAt TEXT NOT NULL)");
+  await sequelize.query("CREATE TABLE IF NOT EXISTS _schema_version (id INTEGER PRIMARY KEY CHECK (id = 1), version TEXT NOT NULL)");
+  const rows = await sequelize.query("SELECT name FROM _migrations", { type: QueryTypes.SELECT });
+  const done = new Set(rows.map((row) => row.name));
+  const applied = [];
+  for (const name of names.filter((file) => !done.has(file))) {
+    const migration = require(path.join(MIGRATIONS_DIR, name));
+    if (migration.rebuildsTables) {
+      await applyRebuild(sequelize, name, migration);
+    } else {
+      await sequelize.transaction(async (transaction) => {
+        await migration.up(migrationContext(sequelize, transaction));
+        await recordMigration(sequelize, name, transaction);
+      });
+    }
+    applied.push(name);
+  }
+  return { version: latest, applied };
+};
+
+module.exports = { migrate, migrationNames };
+
+// npm run migrate: apply pending migrations without starting the server
+if (require.main === module) {
+  const { sequelize } = require("../config/database");
+  migrate(sequelize)
+    .then(({ version, applied }) => {
+      console.log(`✅ Schema at ${version || "no migrations"} (${applied.length} applied)`);
+      return sequelize.close();
+    })
+    .catch((error) => {
+      console.error("❌ Migration failed:", error);
+      process.exit(1);
+    });
+}
+'''
+
+def render_streaming_file():
+    return '''// Rows fetched per query while streaming an export
+const EXPORT_CHUNK_SIZE = parseInt(process.env.EXPORT_CHUNK_SIZE) || 1000;
+
+// Resolves once the socket can take more data, so a slow client never makes us buffer the table
+const writeChunk = (res, chunk) => {
+  if (res.write(chunk)) {
+    return Promise.resolve();
+  }
+  return new Promise((resolve) => {
+    const done = () => {
+      res.off("drain", done);
+      res.off("close", done);
+      resolve();
+    };
+    res.on("drain", done);
+    res.on("close", done);
+  });
+};
+
+const csvValue = (value) => {
+  if (value === null || value === undefined) return "";
+  let text = String(value);
+  if (value instanceof Date) {
+    text = value.toISOString();
+  } else if (typeof value === "object") {
+    text = JSON.stringify(value);
+  }
+  return /[",\\r\\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+};
+
+const csvRow = (values) => values.map(csvValue).join(",") + "\\n";
+
+// json columns are exported as JSON text (csvValue), so an imported cell is parsed back. A cell that is not
+// valid JSON is kept as the plain string it was exported from.
+const csvJson = (value) => {
+  if (value === null) return null;
+  try {
+    return JSON.parse(value);
+  } catch (err) {
+    return value;
+  }
+};
+
+// Rows committed per transaction while importing, and how many rejected rows are described in the response
+const IMPORT_BATCH_SIZE = parseInt(process.env.IMPORT_BATCH_SIZE) || 1000;
+const IMPORT_ERROR_LIMIT = 100;
+
+const parseJsonLine = (text, line) => {
+  try {
+    return { line, record: JSON.parse(text) };
+  } catch (err) {
+    return { line, error: "Invalid JSON" };
+  }
+};
+
+// Yields one { line, record } (or { line, error }) per NDJSON line as the body arrives
+async function* ndjsonRecords(stream) {
+  stream.setEncoding("utf8");
+  let buffered = "";
+  let line = 0;
+  for await (const chunk of stream) {
+    const lines = (buffered + chunk).split("\\n");
+    buffered = lines.pop();
+    for (const text of lines) {
+      line += 1;
+      if (text.trim()) {
+        yield parseJsonLine(text, line);
+      }
+    }
+  }
+  if (buffered.trim()) {
+    yield parseJsonLine(buffered, line + 1);
+  }
+}
+
+// Incremental RFC 4180 parser: quoted fields may contain commas, doubled quotes and newlines,
+// and may be split across chunks. The first row names the columns; empty cells become null.
+async function* csvRecords(stream) {
+  stream.setEncoding("utf8");
+  let header = null;
+  let row = [];
+  let field = "";
+  let inQuotes = false;
+  let quotePending = false;
+  let line = 0;
+  const finishRow = () => {
+    row.push(field);
+    const values = row;
+    row = [];
+    field = "";
+    line += 1;
+    if (values.length === 1 && values[0] === "") {
+      return null;
+    }
+    if (!header) {
+      header = values.map((value) => value.trim());
+      return null;
+    }
+    if (values.length !== header.length) {
+      return { line, error: `Expected ${header.length} columns, got ${values.length}` };
+    }
+    const record = {};
+    header.forEach((column, i) => {
+      record[column] = values[i] === "" ? null : values[i];
+    });
+    return { line, record };
+  };
+  for await (const chunk of stream) {
+    for (const char of chunk) {
+      if (inQuotes) {
+        if (quotePending) {
+          quotePending = false;
+          if (char === '"') {
+            field += char;
+            continue;
+          }
+          inQuotes = false;
+        } else {
+          if (char === '"') {
+            quotePending = true;
+          } else {
+            field += char;
+          }
+          continue;
+        }
+      }
+      if (char === '"' && field === "") {
+        inQuotes = true;
+      } else if (char === ",") {
+        row.push(field);
+        field = "";
+      } else if (char === "\\n") {
+        const parsed = finishRow();
+        if (parsed) {
+          yield parsed;
+        }
+      } else if (char !== "\\r") {
+        field += char;
+      }
+    }
+  }
+  if (field !== "" || row.length > 0) {
+    const parsed = finishRow();
+    if (parsed) {
+      yield parsed;
+    }
+  }
+}
+
+module.exports = { EXPORT_CHUNK_SIZE, IMPORT_BATCH_SIZE, IMPORT_ERROR_LIMIT, writeChunk, csvRow, csvJson, ndjsonRecords, csvRecords };
+'''
+
+def render_includable(model):
+    # belongsTo is a LEFT JOIN; hasMany is separate: one WHERE foreignKey IN (...) query for the whole page
+    # instead of a join that repeats the parent row per child and breaks LIMIT
+    entries = [f'{association["as"]}: {{ association: "{association["as"]}" }}' for association in model["belongsTo"]]
+    entries += [f'{association["as"]}: {{ association: "{association["as"]}", separate: true }}' for association in model["hasMany"]]
+    return f'''
+// Associations ?include= may load. belongsTo ones are joined; each hasMany one is a single extra
+// WHERE foreignKey IN (...) query for every row of the page together.
+const includable = {{ {", ".join(entries)} }};'''
+
+def render_controller_file(model, dependents=()):
+    name = model["name"]
+    field_names = ", ".join(f'"{field["name"]}"' for field in model["fields"])
+    queryable = ", ".join(f'{column}: "{column_type}"' for column, column_type in queryable_columns(model).items())
+    sortable = ", ".join(f'"{column}"' for column in sortable_columns(model))
+    constants = f'''const fields = [{field_names}];
+const columns = ["id", ...fields, "createdAt", "updatedAt"{', "version"' if model["version"] else ""}];
+// Columns clients may filter (?where[column]=) and sort (?sort=) on; each is backed by an index
+const queryable = {{ {queryable} }};
+const sortable = [{sortable}];{render_includable(model) if has_associations(model) else ""}'''
+    imports = [
+        'const { Op } = require("sequelize");',
+        'const { sequelize } = require("../config/database");',
+        f'const {name} = require("../models/{name}");' if not has_associations(model) else f'const {{ {name} }} = require("../models/associations");',
+        'const { BULK_CHUNK_SIZE, READ_BATCH_MAX, chunk, parseIds, findByIds, existingIds, writeRows, bulkResponse } = require("../utils/bulk");',
+        f'const {{ validateCreate, validateUpdate }} = require("../validators/{name}");',
+        'const { validationError } = require("../utils/validation");',
+        'const { updateReturning } = require("../utils/records");',
+        'const { EXPORT_CHUNK_SIZE, IMPORT_BATCH_SIZE, IMPORT_ERROR_LIMIT, writeChunk, csvRow, csvJson, ndjsonRecords, csvRecords } = require("../utils/streaming");',
+        'const { parseInclude, parseListQuery } = require("../utils/query");' if has_associations(model) else 'const { parseListQuery } = require("../utils/query");',
+    ]
+    if generator_options["pagination"] == "cursor":
+        imports.append('const { encodeCursor, decodeCursor, keysetWhere, keysetOrder } = require("../utils/pagination");')
+    elif searchable_fields(model):
+        imports.append('const { encodeCursor, decodeCursor } = require("../utils/pagination");')
+    if searchable_fields(model):
+        imports.append('const { searchQuery } = require("../utils/search");')
+    list_validators = "listValidators" if generator_options["row_counts"] else "pageValidators"
+    imports.append(f'const {{ recordValidators, {list_validators}, notModified }} = require("../middleware/conditional");')
+    if generator_options["cache"]:
+        imports.append('const { cache } = require("../middleware/cache");')
+    if generator_options["write_queue"]:
+        imports.append('const { enqueueWrite } = require("../utils/writer");')
+    if generator_options["row_counts"]:
+        imports.append('const { countRows, recount } = require("../utils/counts");')
+    handlers = [
+        render_create_handler(model),
+        render_list_handler(model),
+        render_read_handler(model),
+        render_read_by_ids_handler(model),
+        render_update_handler(model),
+        render_delete_handler(model, dependents),
+        render_bulk_create_handler(model),
+        render_bulk_update_handler(model),
+        render_bulk_delete_handler(model, dependents),
+        render_export_handler(model),
+        render_import_handler(model),
+    ]
+    if searchable_fields(model):
+        handlers.append(render_search_handler(model))
+    if generator_options["row_counts"]:
+        handlers.append(render_recount_handler(model))
+    return "\n".join(imports) + "\n\n" + constants + "\n\n" + "\n\n".join(handlers) + "\n"
+
+def queryable_columns(model):
+    # Filters and sorts are only allowed where an index can serve them; in SQLite every index
+    # also ends in the rowid, so an index on (field) already orders by (field, id)
+    columns = {"id": "integer", "createdAt": "date", "updatedAt": "date"}
+    leading = {index["fields"][0] for index in model_indexes(model)}
+    for field in model["fields"]:
+        if field["name"] in leading:
+            columns[field["name"]] = field["type"]
+    return columns
+
+def sortable_columns(model):
+    # Keyset cursors cannot step past NULLs, so nullable columns are filter-only
+    optional = {field["name"] for field in model["fields"] if field["optional"]}
+    return [column for column in queryable_columns(model) if column not in optional]
+
+def render_query_file():
+    return '''const { Op } = require("sequelize");
+
+const operators = { eq: Op.eq, ne: Op.ne, gt: Op.gt, gte: Op.gte, lt: Op.lt, lte: Op.lte, in: Op.in };
+
+class QueryError extends Error {}
+
+const parseValue = (column, type, value) => {
+  if (typeof value !== "string") {
+    throw new QueryError(`Invalid value for ${column}`);
+  }
+  if (["integer", "bigint", "float", "double", "decimal"].includes(type)) {
+    if (value.trim() === "" || Number.isNaN(Number(value))) {
+      throw new QueryError(`${column} must be a number`);
+    }
+    return Number(value);
+  }
+  if (type === "boolean") {
+    return value === "true" || value === "1";
+  }
+  if (type === "date") {
+    const date = new Date(value);
+    if (Number.isNaN(date.getTime())) {
+      throw new QueryError(`${column} must be a date`);
+    }
+    return date;
+  }
+  return value;
+};
+
+// ?where[price][gte]=10&where[status]=active -> Sequelize where, limited to the queryable columns
+const parseWhere = (where, queryable) => {
+  const conditions = {};
+  if (where === undefined) {
+    return conditions;
+  }
+  if (!where || typeof where !== "object" || Array.isArray(where)) {
+    throw new QueryError("Filters look like where[field]=value or where[field][gte]=value");
+  }
+  for (const [column, condition] of Object.entries(where)) {
+    if (!queryable[column]) {
+      throw new QueryError(`Cannot filter on ${column}; allowed: ${Object.keys(queryable).join(", ")}`);
+    }
+    const comparisons = condition && typeof condition === "object" && !Array.isArray(condition) ? condition : { eq: condition };
+    conditions[column] = {};
+    for (const [operator, value] of Object.entries(comparisons)) {
+      if (!operators[operator]) {
+        throw new QueryError(`Unknown operator ${operator}; use ${Object.keys(operators).join(", ")}`);
+      }
+      const parse = (item) => parseValue(column, queryable[column], item);
+      conditions[column][operators[operator]] = operator === "in" ? [].concat(value).join(",").split(",").map(parse) : parse(value);
+    }
+  }
+  return conditions;
+};
+
+// ?sort=-price sorts by price descending; ties are always broken by id in the same direction
+const parseSort = (sort, sortable, fallback = "-createdAt") => {
+  const value = typeof sort === "string" && sort ? sort : fallback;
+  const field = value.replace(/^[-+]/, "");
+  if (!sortable.includes(field)) {
+    throw new QueryError(`Cannot sort on ${field}; allowed: ${sortable.join(", ")}`);
+  }
+  return { field, direction: value.startsWith("-") ? "DESC" : "ASC" };
+};
+
+// ?fields=title,price -> attributes; id and the sort column always come back so the cursor can be built
+const parseAttributes = (fields, columns, required) => {
+  if (fields === undefined) {
+    return undefined;
+  }
+  const requested = String(fields).split(",").map((field) => field.trim()).filter(Boolean);
+  const unknown = requested.filter((field) => !columns.includes(field));
+  if (unknown.length > 0) {
+    throw new QueryError(`Unknown fields ${unknown.join(", ")}`);
+  }
+  return [...new Set([...required, ...requested])];
+};
+
+// ?include=post,comments picks eager loads from the controller's includable map, in the order given
+const parseInclude = (include, includable) => {
+  if (include === undefined || include === "") {
+    return [];
+  }
+  if (typeof include !== "string") {
+    throw new QueryError("include is a comma-separated list of associations");
+  }
+  const names = [...new Set(include.split(",").map((name) => name.trim()).filter(Boolean))];
+  const unknown = names.filter((name) => !includable[name]);
+  if (unknown.length > 0) {
+    throw new QueryError(`Cannot include ${unknown.join(", ")}; allowed: ${Object.keys(includable).join(", ")}`);
+  }
+  return names.map((name) => includable[name]);
+};
+
+const parseListQuery = (query, { columns, queryable, sortable, includable }) => {
+  const sort = parseSort(query.sort, sortable);
+  return {
+    where: parseWhere(query.where, queryable),
+    sort,
+    attributes: parseAttributes(query.fields, columns, ["id", sort.field]),
+    include: includable ? parseInclude(query.include, includable) : []
+  };
+};
+
+module.exports = { QueryError, parseInclude, parseListQuery };
+'''
+
+def render_pagination_file():
+    return '''const { Op } = require("sequelize");
+
+// Cursors are opaque to clients: base64url JSON of the last row's sort value, its id and the sort column
+const encodeCursor = (row, field = "createdAt") => {
+  const value = row[field] instanceof Date ? { date: row[field].toISOString() } : row[field];
+  return Buffer.from(JSON.stringify([value, row.id, field])).toString("base64url");
+};
+
+// Returns null when there is no cursor and undefined when the cursor cannot be decoded
+// or was issued for a different sort column
+const decodeCursor = (cursor, field = "createdAt") => {
+  if (!cursor) return null;
+  try {
+    const [value, id, cursorField] = JSON.parse(Buffer.from(cursor, "base64url").toString("utf8"));
+    if (!Number.isInteger(id) || cursorField !== field) return undefined;
+    return { value: value && value.date ? new Date(value.date) : value, id };
+  } catch (err) {
+    return undefined;
+  }
+};
+
+// Rows strictly after the cursor in (field, id) order. The inclusive bound on field keeps SQLite
+// walking the (field, id) index; the OR only drops ties that were already returned.
+const keysetWhere = (cursor, field = "createdAt", direction = "DESC") => {
+  if (!cursor) return {};
+  const [bound, beyond] = direction === "DESC" ? [Op.lte, Op.lt] : [Op.gte, Op.gt];
+  return {
+    [field]: { [bound]: cursor.value },
+    [Op.or]: [{ [field]: { [beyond]: cursor.value } }, { id: { [beyond]: cursor.id } }]
+  };
+};
+
+const keysetOrder = (field = "createdAt", direction = "DESC") => [[field, direction], ["id", direction]];
+
+module.exports = { encodeCursor, decodeCursor, keysetWhere, keysetOrder };
+'''
+
+def render_model_index(index):
+    fields = ", ".join(f'"{field}"' for field in index["fields"])
+    return f'{{ unique: true, fields: [{fields}] }}' if index["unique"] else f'{{ fields: [{fields}] }}'
+
+def render_associations_file(models):
+    associated = [model for model in models if has_associations(model) or model_dependents(models, model["name"])]
+    requires = "\n".join(f'const {model["name"]} = require("./{model["name"]}");' for model in associated)
+    lines = []
+    for model in associated:
+        for kind in ("belongsTo", "hasMany"):
+            for association in model[kind]:
+                lines.append(f'{model["name"]}.{kind}({association["model"]}, {{ foreignKey: "{association["foreignKey"]}", as: "{association["as"]}" }});')
+    names = ", ".join(model["name"] for model in associated)
+    return f'''// Generated from the spec's belongsTo/hasMany entries. Controllers of associated models load their
+// model through this file, so both ends of every association are defined before the first ?include=.
+{requires}
+
+{chr(10).join(lines)}
+
+module.exports = {{ {names} }};
+'''
+
+def render_loader_file(models):
+    entries, loaded = [], []
+    for model in models:
+        keys = ["id"] if model_dependents(models, model["name"]) else []
+        keys += [association["foreignKey"] for association in model["belongsTo"] if any(parent["model"] == model["name"] and parent["foreignKey"] == association["foreignKey"] for other in models for parent in other["hasMany"])]
+        if keys:
+            loaders = ", ".join(f'by{key[:1].upper() + key[1:]}: new BatchLoader({model["name"]}, "{key}"{"" if key == "id" else ", { many: true }"})' for key in keys)
+            entries.append(f'    {model["name"]}: {{ {loaders} }}')
+            loaded.append(model["name"])
+    return f'''const {{ Op }} = require("sequelize");
+const {{ BULK_CHUNK_SIZE, chunk }} = require("./bulk");
+const {{ {", ".join(loaded)} }} = require("../models/associations");
+
+// DataLoader-style batching for code that walks associations row by row. Every load() made in the same
+// turn of the event loop is answered by one SELECT ... WHERE column IN (...), and repeated keys are
+// served from the loader, so a page of N posts asking for their comments costs one query, not N.
+class BatchLoader {{
+  constructor(Model, column, {{ many = false }} = {{}}) {{
+    this.Model = Model;
+    this.column = column;
+    this.many = many;
+    this.results = new Map();
+    this.queue = [];
+  }}
+
+  // The row with this key (or null), or with many: true every row whose column equals it
+  load(key) {{
+    key = Number(key);
+    if (!this.results.has(key)) {{
+      this.results.set(key, new Promise((resolve, reject) => {{
+        this.queue.push({{ key, resolve, reject }});
+        if (this.queue.length === 1) {{
+          setImmediate(() => this.dispatch());
+        }}
+      }}));
+    }}
+    return this.results.get(key);
+  }}
+
+  loadMany(keys) {{
+    return Promise.all(keys.map((key) => this.load(key)));
+  }}
+
+  async dispatch() {{
+    const queue = this.queue;
+    this.queue = [];
+    try {{
+      const groups = new Map();
+      for (const batch of chunk(queue.map((entry) => entry.key), BULK_CHUNK_SIZE)) {{
+        const rows = await this.Model.findAll({{ where: {{ [this.column]: {{ [Op.in]: batch }} }} }});
+        for (const row of rows) {{
+          const key = row[this.column];
+          if (!groups.has(key)) {{
+            groups.set(key, []);
+          }}
+          groups.get(key).push(row);
+        }}
+      }}
+      for (const {{ key, resolve }} of queue) {{
+        const rows = groups.get(key) || [];
+        resolve(this.many ? rows : rows[0] || null);
+      }}
+    }} catch (err) {{
+      for (const {{ key, reject }} of queue) {{
+        this.results.delete(key);
+        reject(err);
+      }}
+    }}
+  }}
+}}
+
+const createLoaders = () => ({{
+{("," + chr(10)).join(entries)}
+}});
+
+// One set of loaders per request: results are never shared between requests, so they cannot go stale
+const loaders = (req) => {{
+  if (!req.loaders) {{
+    req.loaders = createLoaders();
+  }}
+  return req.loaders;
+}};
+
+module.exports = {{ BatchLoader, createLoaders, loaders }};
+'''
+
+def render_models_file(model):
+    name = model["name"]
+    indexes = ", ".join(render_model_index(index) for index in model_indexes(model))
     models_file_first = f'const {{ DataTypes }} = require("sequelize"); const {{ sequelize }} = require("../config/database"); const {name} = sequelize.define("{name}", {{'
     models_file_middle = []
-    models_file_last = f' }}, {{ tableName: "{name.lower()}s", timestamps: true }}); module.exports = {name};'
-    models_file_path = model_directory + f'/{name}.js'
-    for arg in args:
-        for a in arg:
-            middle = f'{a}: {{ type: DataTypes.STRING, allowNull: false, validate: {{ notEmpty: {{ msg: "Please provide {a}" }} }} }},'
-            models_file_middle.append(middle)
-    try:
-        middle_file = ''.join(models_file_middle)
-        entire_file = models_file_first + middle_file + models_file_last
-        write_to_file(models_file_path, entire_file)
-        return print("Models Files Successfully Created...")
-    except:
-        return print("Something Went Wrong When Creating Model Files...")
+    models_file_last = f' }}, {{ tableName: "{table_name(name)}", timestamps: true{", version: true" if model["version"] else ""}, indexes: [{indexes}] }}); module.exports = {name};'
+    for field in model["fields"]:
+        a = field["name"]
+        data_type, validator = field_types[field["type"]]
+        allow_null = "true" if field["optional"] else "false"
+        validate = f', validate: {{ {validator.format(name=a)} }}' if validator else ''
+        middle = f'{a}: {{ type: DataTypes.{data_type}, allowNull: {allow_null}{validate} }},'
+        models_file_middle.append(middle)
+    return models_file_first + ''.join(models_file_middle) + models_file_last
+
+
+def model_routes(model):
+    name = model["name"]
+    return [
+        ("/create", "post", f"create{name}"),
+        ("/read", "get", f"read{name}"),
+        ("/read/:id", "get", f"read{name}FromID"),
+        ("/read/batch", "post", f"read{name}ByIds"),
+        ("/update/:id", "put", f"update{name}"),
+        ("/update/:id", "patch", f"update{name}"),
+        ("/delete/:id", "delete", f"delete{name}"),
+        ("/bulk/create", "post", f"bulkCreate{name}"),
+        ("/bulk/update", "put", f"bulkUpdate{name}"),
+        ("/bulk/delete", "delete", f"bulkDelete{name}"),
+        ("/export", "get", f"export{name}"),
+        ("/import", "post", f"import{name}"),
+    ] + ([("/search", "get", f"search{name}")] if searchable_fields(model) else []) \
+      + ([("/recount", "post", f"recount{name}")] if generator_options["row_counts"] else [])
+
+def render_routes_file(model):
+    name = model["name"]
+    routes = model_routes(model)
+    handlers = ", ".join(dict.fromkeys(handler for _, _, handler in routes))
+    route_lines = "\n".join(f'router.route("{route}").{method}({handler});' for route, method, handler in routes)
+    return f'''const express = require("express");
+const router = express.Router();
+const {{ {handlers} }} = require("../controllers/{name}");
+
+{route_lines}
+
+module.exports = router;
+'''
 
+def render_route_mount(name):
+    if generator_options["lazy_routes"]:
+        return f'app.use("/api/{name}", lazyRoute(() => require("./routes/{name}")));'
+    return f'app.use("/api/{name}", require("./routes/{name}"));'
+
+def render_route_block(names):
+    route_mounts = [render_route_mount(name) for name in names]
+    if generator_options["lazy_routes"]:
+        # Inside the markers so a hand-edited index.js still gets the import when the block is merged in
+        route_mounts.insert(0, 'const { lazyRoute } = require("./utils/lazy");')
+    return "\n".join([routes_start_marker] + route_mounts + [routes_end_marker])
+
+def render_lazy_file():
+    return '''// Defers require() of a model's router, and with it the controller and the model, until the first
+// request under its prefix. Startup no longer loads every model, so cold start stays flat as models are added.
+const lazyRoute = (load) => {
+  let router = null;
+  return (req, res, next) => {
+    if (!router) {
+      router = load();
+    }
+    return router(req, res, next);
+  };
+};
 
-def create_routes_files(name):
-    routes_file = f'const express = require("express"); const router = express.Router(); const {{ create{name}, read{name}, read{name}FromID, update{name}, delete{name} }} = require("../controllers/{name}"); router.route("/create").post(create{name}); router.route("/read").get(read{name}); router.route("/read/:id").get(read{name}FromID); router.route("/update/:id").put(update{name}); router.route("/delete/:id").delete(delete{name}); module.exports = router;'
-    routes_file_path = route_directory + f'/{name}.js'
-    try:
-        write_to_file(routes_file_path, routes_file)
-        return print("Routes Files Successfully Created...")
-    except:
-        return print("Something Went Wrong When Creating Routes Files...")
-        
-def create_index_file(name):
-    index_file = f'''const express = require("express");
+module.exports = { lazyRoute };
+'''
+
+def render_stats_route():
+    stats = []
+    if generator_options["cache"]:
+        stats.append('cache: require("./middleware/cache").cache.stats()')
+    if generator_options["write_queue"]:
+        stats.append('writes: require("./utils/writer").stats()')
+    if generator_options["concurrency_limit"]:
+        stats.append('limiter: require("./middleware/limiter").stats()')
+    if not stats:
+        return ""
+    return f'''
+// Server stats
+app.get("/_stats", (req, res) => {{
+  res.json({{ {", ".join(stats)} }});
+}});
+'''
+
+def render_limiter_mount():
+    if not generator_options["concurrency_limit"]:
+        return ""
+    return '''
+// Before body parsing, so a request that is turned away with 503 costs almost nothing
+app.use("/api", require("./middleware/limiter").concurrencyLimiter);
+'''
+
+def render_limiter_file():
+    concurrency_max = generator_options["concurrency_limit"]
+    return f'''// Adaptive concurrency limit for /api. At most `limit` requests run at once and the rest wait in a short
+// priority queue, instead of piling up behind the SQLite lock until clients time out. The limit backs off
+// by 10% when requests run slower than LATENCY_TARGET_MS and grows back by about one per round of fast
+// requests while every slot is busy (AIMD).
+const CONCURRENCY_MAX = parseInt(process.env.CONCURRENCY_MAX) || {concurrency_max};
+const CONCURRENCY_MIN = Math.min(parseInt(process.env.CONCURRENCY_MIN) || 2, CONCURRENCY_MAX);
+const QUEUE_MAX = parseInt(process.env.QUEUE_MAX) || {concurrency_max * 4};
+const QUEUE_TIMEOUT_MS = parseInt(process.env.QUEUE_TIMEOUT_MS) || 500;
+const LATENCY_TARGET_MS = parseInt(process.env.LATENCY_TARGET_MS) || 100;
+
+// Lower runs first: reads, then single-record writes, then bulk writes, imports and exports
+const PRIORITIES = ["read", "write", "bulk"];
+const priorityOf = (req) => {{
+  if (/^\\/\\w+\\/(?:bulk|import|export)\\b/.test(req.path)) {{
+    return 2;
+  }}
+  return req.method === "GET" || req.method === "HEAD" ? 0 : 1;
+}};
+
+let limit = CONCURRENCY_MAX;
+let inFlight = 0;
+let queued = 0;
+let averageMs = 0;
+let lastDecrease = 0;
+const queues = PRIORITIES.map(() => []);
+const counters = {{ admitted: 0, waited: 0 }};
+const shedCounts = {{ queueFull: 0, queueWait: 0, queueTimeout: 0, displaced: 0 }};
+
+// Bulk requests are slow by nature, so only reads and single writes move the limit
+const adjust = (priority, elapsed) => {{
+  averageMs = averageMs ? averageMs * 0.9 + elapsed * 0.1 : elapsed;
+  if (priority === 2) {{
+    return;
+  }}
+  const now = Date.now();
+  if (elapsed > LATENCY_TARGET_MS) {{
+    if (now - lastDecrease > LATENCY_TARGET_MS) {{
+      limit = Math.max(CONCURRENCY_MIN, limit * 0.9);
+      lastDecrease = now;
+    }}
+  }} else if (inFlight + 1 >= Math.floor(limit)) {{
+    limit = Math.min(CONCURRENCY_MAX, limit + 1 / limit);
+  }}
+}};
+
+// Roughly how long the current backlog takes to clear, so clients do not retry straight into it
+const retryAfter = () => String(Math.max(1, Math.ceil((queued * averageMs) / Math.floor(limit) / 1000)));
+
+const shed = (res, reason) => {{
+  shedCounts[reason] += 1;
+  res.set("Retry-After", retryAfter());
+  res.status(503).json({{ error: "Server is busy, retry later" }});
+}};
+
+const start = (req, res, next, priority) => {{
+  inFlight += 1;
+  counters.admitted += 1;
+  const started = Date.now();
+  let done = false;
+  const release = () => {{
+    if (done) return;
+    done = true;
+    inFlight -= 1;
+    adjust(priority, Date.now() - started);
+    drain();
+  }};
+  res.once("finish", release);
+  res.once("close", release);
+  next();
+}};
+
+const remove = (waiter) => {{
+  const queue = queues[waiter.priority];
+  const index = queue.indexOf(waiter);
+  if (index === -1) {{
+    return false;
+  }}
+  queue.splice(index, 1);
+  queued -= 1;
+  clearTimeout(waiter.timer);
+  return true;
+}};
+
+const drain = () => {{
+  while (queued > 0 && inFlight < Math.floor(limit)) {{
+    const waiter = queues.find((queue) => queue.length > 0)[0];
+    remove(waiter);
+    start(waiter.req, waiter.res, waiter.next, waiter.priority);
+  }}
+}};
+
+const concurrencyLimiter = (req, res, next) => {{
+  const priority = priorityOf(req);
+  if (queued === 0 && inFlight < Math.floor(limit)) {{
+    return start(req, res, next, priority);
+  }}
+  // Fail fast when the requests already ahead of this one would take longer than it is allowed to wait
+  const ahead = queues.slice(0, priority + 1).reduce((total, queue) => total + queue.length, 0);
+  if (ahead > 0 && ((ahead + 1) * averageMs) / Math.floor(limit) > QUEUE_TIMEOUT_MS) {{
+    return shed(res, "queueWait");
+  }}
+  if (queued >= QUEUE_MAX) {{
+    // A full queue makes room by turning away the newest waiter of a lower priority, if there is one
+    const lower = queues.slice(priority + 1).reverse().find((queue) => queue.length > 0);
+    if (!lower) {{
+      return shed(res, "queueFull");
+    }}
+    const displaced = lower[lower.length - 1];
+    remove(displaced);
+    shed(displaced.res, "displaced");
+  }}
+  const waiter = {{ req, res, next, priority }};
+  waiter.timer = setTimeout(() => {{
+    if (remove(waiter)) {{
+      shed(res, "queueTimeout");
+    }}
+  }}, QUEUE_TIMEOUT_MS);
+  // A client that gives up while queued just leaves the queue
+  res.once("close", () => remove(waiter));
+  queues[priority].push(waiter);
+  queued += 1;
+  counters.waited += 1;
+}};
+
+const stats = () => ({{
+  limit: Math.floor(limit),
+  inFlight,
+  queued: Object.fromEntries(PRIORITIES.map((name, i) => [name, queues[i].length])),
+  averageMs: Math.round(averageMs * 10) / 10,
+  ...counters,
+  shed: {{ ...shedCounts }}
+}});
+
+module.exports = {{ concurrencyLimiter, stats }};
+'''
+
+def render_index_file(names):
+    route_mounts = render_route_block(names)
+    index_file = f'''// First, so every module below (config/database.js reads SLOW_QUERY_MS as it loads) sees .env
+require("dotenv").config({{ path: "./.env" }});
+const express = require("express");
+const compression = require("compression");
+const zlib = require("zlib");
 const app = express();
 const cors = require("cors");
 const PORT = process.env.PORT || 3002;
 const {{ connectDB }} = require("./config/database");
-require("dotenv").config({{ path: "./.env" }});
-
-app.use(express.json());
-app.use(express.urlencoded({{ extended: false }}));
+const {{ metricsMiddleware, metricsHandler }} = require("./middleware/metrics");
+
+// Requests larger than this are refused with 413 before they are buffered
+const BODY_LIMIT = process.env.BODY_LIMIT || "{generator_options["body_limit"]}";
+// Responses smaller than this are sent as-is; compressing them costs more CPU than it saves on the wire
+const COMPRESSION_THRESHOLD = parseInt(process.env.COMPRESSION_THRESHOLD) || {generator_options["compression_threshold"]};
+// Keep idle connections open longer than the reverse proxy does, so the proxy always closes them first
+const KEEP_ALIVE_TIMEOUT_MS = parseInt(process.env.KEEP_ALIVE_TIMEOUT_MS) || {generator_options["keep_alive_timeout_ms"]};
+
+// First, so request timings include compression and body parsing
+app.use(metricsMiddleware);
+{render_limiter_mount()}
+// Brotli when the client accepts it, gzip otherwise. Quality 4 keeps brotli fast enough for per-request use.
+app.use(compression({{
+  threshold: COMPRESSION_THRESHOLD,
+  level: 6,
+  brotli: {{ params: {{ [zlib.constants.BROTLI_PARAM_QUALITY]: 4 }} }},
+  filter: (req, res) => {{
+    if (req.headers["x-no-compression"]) {{
+      return false;
+    }}
+    return compression.filter(req, res);
+  }}
+}}));
+app.use(express.json({{ limit: BODY_LIMIT }}));
+app.use(express.urlencoded({{ extended: false, limit: BODY_LIMIT }}));
 app.use(cors());
 
 // Connect to database
@@ -115,23 +2532,194 @@ app.get("/", (req, res) => {{
   res.json({{ app: "running" }});
 }});
 
+// Prometheus scrape endpoint
+app.get("/metrics", metricsHandler);
+{render_stats_route()}
 // Routes
-app.use("/api/{name}", require("./routes/{name}"));
+{route_mounts}
 
-app.listen(PORT, () => {{
+app.use((err, req, res, next) => {{
+  if (err.type === "entity.too.large") {{
+    return res.status(413).json({{ error: "Request body is larger than " + BODY_LIMIT }});
+  }}
+  next(err);
+}});
+
+const server = app.listen(PORT, () => {{
   console.log("✅ Listening on port " + PORT);
-}});'''
-    index_file_path = f'{current_path}/index.js'
-    
-    if path.exists("./index.js"):
-        print("index.js file already exists...Appending route...")
-        with open("./index.js", "a") as index_file:
-            index_file.write(f'\napp.use("/api/{name}", require("./routes/{name}"));')
-    else:
-        write_to_file(index_file_path, index_file)
-        return print("index.js Files Successfully Created...")
+}});
+// headersTimeout must outlast keepAliveTimeout or Node drops a reused connection mid-request
+server.keepAliveTimeout = KEEP_ALIVE_TIMEOUT_MS;
+server.headersTimeout = KEEP_ALIVE_TIMEOUT_MS + 1000;'''
+    return index_file
+
+def render_writer_file():
+    return '''const { Transaction } = require("sequelize");
+const { sequelize } = require("../config/database");
+
+// Writes that arrive within WRITE_BATCH_WINDOW_MS of each other share one transaction and one commit
+const WRITE_BATCH_WINDOW_MS = parseInt(process.env.WRITE_BATCH_WINDOW_MS) || 2;
+const WRITE_BATCH_MAX = parseInt(process.env.WRITE_BATCH_MAX) || 200;
+
+const pending = [];
+let timer = null;
+let writing = false;
+const counters = { operations: 0, failed: 0, batches: 0, largestBatch: 0 };
+
+const schedule = () => {
+  if (writing || timer) return;
+  timer = setTimeout(flush, pending.length >= WRITE_BATCH_MAX ? 0 : WRITE_BATCH_WINDOW_MS);
+};
+
+// One IMMEDIATE transaction per batch takes the write lock up front, so the single writer never
+// deadlocks upgrading a read lock. Each operation runs in its own savepoint: a failing one is rolled
+// back and rejected on its own while the rest of the batch still commits.
+const flush = async () => {
+  timer = null;
+  const batch = pending.splice(0, WRITE_BATCH_MAX);
+  writing = true;
+  const outcomes = [];
+  try {
+    await sequelize.transaction({ type: Transaction.TYPES.IMMEDIATE }, async (transaction) => {
+      for (const operation of batch) {
+        try {
+          outcomes.push({ value: await sequelize.transaction({ transaction }, operation.run) });
+        } catch (error) {
+          outcomes.push({ error });
+        }
+      }
+    });
+    // Callers only hear back once the commit has succeeded
+    batch.forEach((operation, i) => (outcomes[i].error ? operation.reject(outcomes[i].error) : operation.resolve(outcomes[i].value)));
+    counters.failed += outcomes.filter((outcome) => outcome.error).length;
+  } catch (error) {
+    // The commit itself failed, so nothing in the batch was written
+    batch.forEach((operation) => operation.reject(error));
+    counters.failed += batch.length;
+  }
+  counters.operations += batch.length;
+  counters.batches += 1;
+  counters.largestBatch = Math.max(counters.largestBatch, batch.length);
+  writing = false;
+  if (pending.length > 0) {
+    schedule();
+  }
+};
+
+// Runs run(transaction) in the next group commit and resolves with its result once that commit is done
+const enqueueWrite = (run) =>
+  new Promise((resolve, reject) => {
+    pending.push({ run, resolve, reject });
+    schedule();
+  });
+
+const stats = () => ({
+  ...counters,
+  pending: pending.length,
+  averageBatch: counters.batches ? counters.operations / counters.batches : 0
+});
+
+module.exports = { enqueueWrite, stats };
+'''
+
+def render_cluster_file():
+    relay = '''
+  // Cache invalidations from one worker are passed on to all the others
+  worker.on("message", (message) => {
+    if (message && message.type === "cache:invalidate") {
+      for (const other of Object.values(cluster.workers)) {
+        if (other !== worker) {
+          other.send(message);
+        }
+      }
+    }
+  });''' if generator_options["cache"] else ""
+    return f'''const cluster = require("cluster");
+const os = require("os");
+require("dotenv").config({{ path: "./.env" }});
+
+// One worker per core unless WEB_CONCURRENCY says otherwise
+const WORKERS = parseInt(process.env.WEB_CONCURRENCY) || (os.availableParallelism ? os.availableParallelism() : os.cpus().length);
+// How long a stopping worker gets to finish its in-flight requests before it is killed
+const SHUTDOWN_TIMEOUT_MS = parseInt(process.env.SHUTDOWN_TIMEOUT_MS) || 10000;
+
+if (cluster.isWorker) {{
+  require("./index");
+}} else {{
+  const {{ sequelize, connectDB }} = require("./config/database");
+  const {{ migrate }} = require("./utils/migrations");
+  let stopping = false;
+
+  const fork = () => {{
+    const worker = cluster.fork();{relay}
+    return worker;
+  }};
+
+  // disconnect() stops the worker accepting connections and lets it exit once open requests finish
+  const stop = (worker) => {{
+    const timer = setTimeout(() => worker.kill(), SHUTDOWN_TIMEOUT_MS);
+    worker.once("exit", () => clearTimeout(timer));
+    worker.disconnect();
+  }};
+
+  // Rolling restart: each replacement is listening before the worker it replaces stops, so no request is refused.
+  // Workers never migrate, so the primary applies a deploy's new migrations first; if that fails, the running
+  // workers are kept rather than replaced by code that expects the new schema.
+  const restart = async () => {{
+    try {{
+      const {{ version, applied }} = await migrate(sequelize);
+      console.log(`✅ Schema at ${{version || "no migrations"}}${{applied.length ? ` (applied ${{applied.join(", ")}})` : ""}}`);
+    }} catch (error) {{
+      console.error("❌ Migration failed, keeping the current workers:", error);
+      return;
+    }}
+    for (const worker of Object.values(cluster.workers)) {{
+      const replacement = fork();
+      await new Promise((resolve) => {{
+        replacement.once("listening", resolve);
+        replacement.once("exit", resolve);
+      }});
+      stop(worker);
+    }}
+  }};
+
+  cluster.on("exit", (worker, code, signal) => {{
+    if (stopping) {{
+      if (Object.keys(cluster.workers).length === 0) {{
+        process.exit(0);
+      }}
+      return;
+    }}
+    if (!worker.exitedAfterDisconnect) {{
+      // The delay keeps a worker that crashes on startup from turning into a fork loop
+      console.log(`⚠️  Worker ${{worker.process.pid}} died (${{signal || code}}), starting a new one`);
+      setTimeout(() => stopping || fork(), 1000);
+    }}
+  }});
+
+  process.on("SIGHUP", () => {{
+    console.log("🔄 Restarting workers");
+    restart();
+  }});
+
+  for (const signal of ["SIGINT", "SIGTERM"]) {{
+    process.on(signal, () => {{
+      stopping = true;
+      Object.values(cluster.workers).forEach(stop);
+    }});
+  }}
+
+  // The schema is synced here, once, so workers never race each other to create tables
+  connectDB().then(() => {{
+    console.log(`✅ Starting ${{WORKERS}} workers`);
+    for (let i = 0; i < WORKERS; i += 1) {{
+      fork();
+    }}
+  }});
+}}
+'''
 
-def create_package_file():
+def render_package_file():
     package_file = '''{
   "name": "generate-sqlite-server",
   "version": "1.0.0",
@@ -141,8 +2729,14 @@ def create_package_file():
     "test": "echo \\"Error: no test specified\\" && exit 1",
     "start": "nodemon index.js",
     "dev": "nodemon index.js",
+    "migrate": "node utils/migrations.js",
+    "bench:validation": "node bench/validation.js",''' + ('''
+    "start:cluster": "node cluster.js",''' if generator_options["cluster"] else "") + '''
     "postinstall": "npm rebuild sqlite3 || echo 'Please run: npm rebuild sqlite3'"
   },
+  "nodemonConfig": {
+    "ignore": [".generator-manifest.json", "database.sqlite*"]
+  },
   "pnpm": {
     "onlyBuiltDependencies": ["sqlite3"]
   },
@@ -150,6 +2744,7 @@ def create_package_file():
   "author": "",
   "license": "ISC",
   "dependencies": {
+    "compression": "^1.8.0",
     "cors": "^2.8.5",
     "dotenv": "^16.3.1",
     "express": "^4.18.2",
@@ -158,18 +2753,144 @@ def create_package_file():
     "sqlite3": "^5.1.7"
   }
 }'''
-    package_file_path = current_path + '/package.json'
-    try:
-        write_to_file(package_file_path, package_file)
-        return print("Package Files Successfully Created...")
-    except:
-        return print("Something Went Wrong When Creating Package Files...")
+    return package_file
+
+def render_server_files(models):
+    # Everything is rendered in memory first so a whole spec costs one pass over the disk
+    models = normalize_models(models)
+    files = {"config/database.js": render_config_file(), "utils/migrations.js": render_migrations_file()}
+    for model in models:
+        name = model["name"]
+        files[f"controllers/{name}.js"] = render_controller_file(model, model_dependents(models, name))
+        files[f"models/{name}.js"] = render_models_file(model)
+        files[f"routes/{name}.js"] = render_routes_file(model)
+        files[f"validators/{name}.js"] = render_validators_file(model)
+    if any(has_associations(model) for model in models):
+        files["models/associations.js"] = render_associations_file(models)
+        files["utils/loader.js"] = render_loader_file(models)
+    searchable = any(searchable_fields(model) for model in models)
+    # Search results are always cursor-paged, whatever the list routes use
+    if generator_options["pagination"] == "cursor" or searchable:
+        files["utils/pagination.js"] = render_pagination_file()
+    if searchable:
+        files["utils/search.js"] = render_search_file()
+    files["middleware/conditional.js"] = render_conditional_file()
+    files["middleware/metrics.js"] = render_metrics_file()
+    if generator_options["cache"]:
+        files["middleware/cache.js"] = render_cache_file()
+    files["utils/bulk.js"] = render_bulk_file()
+    files["utils/validation.js"] = render_validation_file()
+    files["bench/validation.js"] = render_validation_bench_file(models)
+    files["utils/records.js"] = render_records_file()
+    files["utils/query.js"] = render_query_file()
+    files["utils/streaming.js"] = render_streaming_file()
+    if generator_options["write_queue"]:
+        files["utils/writer.js"] = render_writer_file()
+    if generator_options["lazy_routes"]:
+        files["utils/lazy.js"] = render_lazy_file()
+    if generator_options["concurrency_limit"]:
+        files["middleware/limiter.js"] = render_limiter_file()
+    if generator_options["row_counts"]:
+        files["utils/counts.js"] = render_counts_file()
+    files["index.js"] = render_index_file([model["name"] for model in models])
+    if generator_options["cluster"]:
+        files["cluster.js"] = render_cluster_file()
+    files["package.json"] = render_package_file()
+    return files
 
 def write_to_file(path, content):
     file = open(path, "w", encoding="utf-8")
     file.write(content)
     file.close()
 
+def file_hash(content):
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def write_generated_files(root, files, previous_hashes=None):
+    # Files whose rendered hash matches the last run are left alone so nodemon and Docker layer caches stay warm
+    previous_hashes = previous_hashes or {}
+    hashes = {}
+    written = []
+    for relative_path, content in files.items():
+        hashes[relative_path] = file_hash(content)
+        target = os.path.join(root, relative_path)
+        if previous_hashes.get(relative_path) == hashes[relative_path] and path.exists(target):
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        write_to_file(target, content)
+        written.append(relative_path)
+    return hashes, written
+
+# ----------------------------------------- Generation manifest ----------------------------
+def load_manifest(root):
+    manifest_path = os.path.join(root, manifest_file_name)
+    if not path.exists(manifest_path):
+        return {"models": [], "options": {}, "files": {}}
+    try:
+        with open(manifest_path, encoding="utf-8") as manifest:
+            return {"options": {}, **json.load(manifest)}
+    except ValueError:
+        print(f"⚠️  {manifest_file_name} is not valid JSON, regenerating every file...")
+        return {"models": [], "options": {}, "files": {}}
+
+def save_manifest(root, models, hashes, index_template=None):
+    # index_template: hash of the last index.js written straight from the template, to tell hand edits apart
+    manifest = json.dumps({"models": models, "options": generator_options, "files": hashes, "index_template": index_template}, indent=2, sort_keys=True) + "\n"
+    manifest_path = os.path.join(root, manifest_file_name)
+    if path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as existing:
+            if existing.read() == manifest:
+                return
+    write_to_file(manifest_path, manifest)
+
+def mounted_route_names(index_file):
+    return re.findall(r'^app\.use\("/api/(\w+)", (?:lazyRoute\(\(\) => )?require\("\./routes/\w+"\)\)?\);$', index_file, re.MULTILINE)
+
+def legacy_models(root):
+    # A directory from before the manifest existed. That generator wrote each model as one line of required
+    # STRING fields, so the models index.js mounts (and any other model file) can be read back exactly.
+    index_path = os.path.join(root, "index.js")
+    models_path = os.path.join(root, "models")
+    names = []
+    if path.exists(index_path):
+        with open(index_path, encoding="utf-8") as index_file:
+            names = mounted_route_names(index_file.read())
+    if path.exists(models_path):
+        names += sorted(name[:-3] for name in os.listdir(models_path) if name.endswith(".js") and name[:-3] not in names + ["associations"])
+    models, unreadable = [], []
+    for name in names:
+        model_path = os.path.join(models_path, f"{name}.js")
+        body = None
+        if path.exists(model_path):
+            with open(model_path, encoding="utf-8") as model_file:
+                match = re.search(rf'sequelize\.define\("{name}", \{{(.*?) \}}, \{{ tableName: "{table_name(name)}"', model_file.read())
+            body = match and match.group(1)
+        field_pattern = r'(\w+): \{ type: DataTypes\.STRING, allowNull: false, validate: \{ notEmpty: \{ msg: "Please provide \1" \} \} \},'
+        fields = re.findall(field_pattern, body or "")
+        if body is None or re.sub(field_pattern, "", body):
+            unreadable.append(name)
+        else:
+            models.append(normalize_model({"name": name, "fields": fields}))
+    return models, unreadable
+
+def merge_index_file(existing, names):
+    # Only the route block is ours once someone has edited index.js by hand
+    route_block = render_route_block(names)
+    if routes_start_marker in existing and routes_end_marker in existing:
+        before, rest = existing.split(routes_start_marker, 1)
+        after = rest.split(routes_end_marker, 1)[1]
+        return before + route_block + after
+    # index.js from before the markers existed: fold the appended mounts into one block
+    lines = existing.split("\n")
+    mount_lines = [i for i, line in enumerate(lines) if mounted_route_names(line)]
+    if mount_lines:
+        lines = [line for i, line in enumerate(lines) if i not in mount_lines[1:]]
+        lines[mount_lines[0]] = route_block
+    else:
+        listen_line = next((i for i, line in enumerate(lines) if "app.listen(" in line), len(lines))
+        lines.insert(listen_line, route_block + "\n")
+    return "\n".join(lines)
+
 def create_env_file():
     env_file = '''PORT=3002'''
     env_file_path = current_path + '/.env'
@@ -272,7 +2993,9 @@ coverage/
 build/
 .tmp/
 .cache/
-database.sqlite'''
+database.sqlite
+database.sqlite-wal
+database.sqlite-shm'''
     gitignore_path = current_path + '/.gitignore'
     if not path.exists(gitignore_path):
         try:
@@ -338,18 +3061,254 @@ Your custom model routes will be available at `/api/{model_name}/`
 
 ### Standard CRUD Operations
 - `POST /api/{model}/create` - Create new record
-- `GET /api/{model}/read` - Read all records (with pagination)
+- `GET /api/{model}/read` - Read records newest first, one page at a time (see Pagination)
 - `GET /api/{model}/read/:id` - Read specific record by ID
-- `PUT /api/{model}/update/:id` - Update record by ID
+- `GET /api/{model}/read?ids=3,1,2` or `POST /api/{model}/read/batch` with `[3, 1, 2]` - Read several records by ID at once (see Batch Reads)
+- `PUT` or `PATCH /api/{model}/update/:id` - Update record by ID; only the fields in the body are written
 - `DELETE /api/{model}/delete/:id` - Delete record by ID
 
+Updates are a single `UPDATE ... RETURNING *` statement, so the response is the updated row without a second read.
+
+### Validation
+
+Every create, update, bulk item and import line is checked by `validators/{model}.js` before Sequelize is involved. These validators are compiled from the model's field list. They apply the model's rules as a few inline checks per field: required fields, type, non-empty strings, numbers, dates and UUIDs. Fields that are not in the model are dropped. Booleans accept `true`/`false`, `"true"`/`"false"`, `1`/`0` and `"1"`/`"0"`, and are stored as `true` or `false`. A bad request gets a `400` that lists every failing field at once:
+
+```json
+{ "error": "title is required; price must be a decimal", "errors": [{ "field": "title", "message": "title is required" }, { "field": "price", "message": "price must be a decimal" }] }
+```
+
+Rejecting bad input this way costs no model instance and no trip through Sequelize. To compare it with building a model and calling `validate()` on rejected payloads, run `npm run bench:validation` (`BENCH_ITERATIONS` sets the payloads per model, default 20000).
+
+### Batch Reads
+
+A client that already holds a list of ids can fetch all of them in one request instead of calling `/read/:id` once per id. Ids go in the query string (`?ids=3,1,2`), or in a `POST /read/batch` body as an array or `{ "ids": [...] }` when the list is too long for a URL. The response is `{ data, missing }`. `data` has one entry per requested id, in request order, with `null` where the record does not exist. `missing` lists those ids. The server runs one `SELECT ... WHERE id IN (...)` per `BULK_CHUNK_SIZE` ids, which keeps each query under SQLite's variable limit, and fetches duplicate ids once. A request can name up to `READ_BATCH_MAX` ids (default 1000).
+
+### Optimistic Locking
+
+Add `"version": true` to a model in the spec and it gets a `version` column, which starts at 0 and is bumped by every update (bulk ones included). Send the version you last read as `version` in the update body, or as `?version=` on a delete. If someone else changed the record in the meantime, nothing is written and the response is `409` with the record's `current` state. Requests without a version skip the check.
+
+### Bulk Operations
+- `POST /api/{model}/bulk/create` - Body is an array of records
+- `PUT /api/{model}/bulk/update` - Body is an array of `{ id, ...fields }`; only the fields you send are written
+- `DELETE /api/{model}/bulk/delete` - Body is an array of ids (or `{ "ids": [...] }`)
+
+Each bulk request runs in a single transaction, `BULK_CHUNK_SIZE` rows per statement (default set at generation time with `--bulk-chunk-size`). The response is `{ results, succeeded, failed }` with one `{ index, status, id, error }` entry per item, in request order. Items that fail validation (with their `errors` list) or do not exist are reported individually; the rest are still written. Each chunk of a bulk create, update or delete runs in a savepoint. When the database rejects a chunk, that chunk is rolled back and retried one row at a time. Examples are a duplicate unique value, a missing parent, or a parent that still has children. Only the conflicting rows fail, with `409` for unique and foreign-key conflicts and `400` for other constraints.
+
+### Export
+- `GET /api/{model}/export?format=ndjson` - Stream every row as newline-delimited JSON (default)
+- `GET /api/{model}/export?format=csv` - Stream every row as CSV with a header line
+
+Exports walk the primary key `EXPORT_CHUNK_SIZE` rows at a time (default 1000) and wait for the client to drain each chunk, so memory stays flat however large the table is.
+
+### Import
+- `POST /api/{model}/import` with `Content-Type: application/x-ndjson` - One JSON record per line
+- `POST /api/{model}/import` with `Content-Type: text/csv` - Header line naming the fields, then one record per line
+
+The body is parsed as it streams in and each record is validated against the model's fields. CSV cells are text, so numbers, dates and booleans are accepted in their text form, and `json` cells are parsed as JSON (a cell that is not valid JSON is stored as a string). Valid records are inserted `IMPORT_BATCH_SIZE` rows per transaction (default 1000). A record that breaks a unique or foreign-key constraint is rejected with its line number while the rest of its batch is still inserted. The response is `{ accepted, rejected, errors }`, where `errors` describes up to the first 100 rejected lines. This is much faster than seeding through thousands of `POST /create` calls, each with its own commit.
+
+## Conditional Requests
+
+`read` and `read/:id` responses carry a weak `ETag` and a `Last-Modified` header. A record's ETag comes from its `id` and `updatedAt`. Send them back as `If-None-Match` / `If-Modified-Since` and an unchanged response comes back as `304 Not Modified` with no body.
+
+A list page's ETag is a hash of each row's `id` and `updatedAt` plus `next`/`total`, so it costs no extra query and no serialization. A `304` saves encoding and sending the body, but not querying the page. Pages requested with `?include=`, or with a `?fields=` list that leaves out `updatedAt`, carry no ETag. Lists carry no `Last-Modified`, because the newest `updatedAt` does not change when a row is deleted. With `--row-counts` the table's row count is a single lookup, so list ETags come from `MAX(updatedAt)` (one seek on the `updatedAt` index), the `_counts` row and the request URL instead. Those are checked before the page is queried, and list responses also carry `Last-Modified`.
+
+## Read Cache
+
+Servers generated with `--cache` keep serialized `read` and `read/:id` responses in a bounded in-process LRU (`middleware/cache.js`). Entries expire after `CACHE_TTL_MS` (default 30000) and at most `CACHE_MAX_ENTRIES` (default 1000) are kept. Create, update, delete, bulk and import requests drop the exact records they touched plus that model's cached list pages. `GET /_stats` reports hits, misses, evictions and the hit rate.
+
+## Pagination
+
+`GET /api/{model}/read?limit=25` returns `{ data, next, limit }`. Pass the `next` value back as `?cursor=` to fetch the following page; `next` is `null` on the last page. Pages walk the `(createdAt, id)` index, so page 10,000 costs the same as page 1. Add `?count=true` when you also need `total` (this runs a `COUNT(*)`).
+
+Servers generated with `--pagination offset` keep the classic `?page=&limit=` behaviour and always return `total`.
+
+### Row Counts
+
+Servers generated with `--row-counts` stop paying for that `COUNT(*)` on unfiltered lists. A migration creates a `_counts` table with one row per model table. An insert trigger and a delete trigger keep each row exact, inside the same transaction as the write. An unfiltered `total`, and the row count inside list ETags, are then read from `_counts` with a single primary-key lookup, however large the table. Filtered lists (`?where[...]`) still count the matching rows.
+
+The triggers cover every write that goes through SQLite, including bulk routes and imports. The only way for a count to drift is for rows to change while the triggers are missing, for example after rebuilding a table by hand. `POST /api/{model}/recount` runs an exact `COUNT(*)`, stores it, and returns `{ total }`.
+
+## Filtering, Sorting And Field Selection
+
+List endpoints accept:
+- `?fields=title,price` - Return only these columns (`id` and the sort column are always included)
+- `?where[sku]=ABC-1` - Equality filter
+- `?where[publishedAt][gte]=2024-01-01&where[publishedAt][lt]=2025-01-01` - Range filter; operators are `eq`, `ne`, `gt`, `gte`, `lt`, `lte` and `in` (comma-separated)
+- `?sort=-publishedAt` - Sort column, prefixed with `-` for descending (default `-createdAt`)
+
+Only `id`, `createdAt`, `updatedAt` and fields declared with `:index`/`:unique` (or leading a composite index) can be filtered or sorted on, so every allowed query is index-backed. Other columns get a `400` listing the allowed ones. Optional fields can be filtered but not sorted on. Cursors are tied to the sort column they were issued for.
+
+## Full-Text Search
+
+Mark `string` or `text` fields as `:searchable` in a spec (`"description:text:searchable"`) and the model gets `GET /api/{model}/search?q=red apple&limit=25`. A migration creates an SQLite FTS5 index over those columns (`{table}_fts`) plus triggers that keep it in sync on every insert, update and delete. When the searchable columns change, the next migration rebuilds the index from the table.
+
+Every word in `q` must match and `appl*` matches by prefix. Results come best match first by bm25 score, returned as `rank` on each row, and page through `next`/`?cursor=` the same way as `read`, even on servers generated with `--pagination offset`. A lookup reads only the index entries for the query terms instead of scanning the table the way `LIKE '%x%'` does.
+
+## Associations
+
+A spec model can declare `belongsTo` and `hasMany` relations to other models in the spec:
+```json
+{ "name": "Post", "fields": ["title"], "belongsTo": [{ "model": "User", "as": "author" }], "hasMany": ["Comment"] }
+```
+
+Entries are a model name or `{ "model", "as", "foreignKey" }`, plus `"optional": true` on a `belongsTo` whose foreign key may be null. By default `belongsTo: ["User"]` is named `user` with the foreign key `userId`, and `hasMany: ["Comment"]` on `Post` is named `comments` and reads `Comment.postId`. A `hasMany` without a matching `belongsTo` on the child adds one. Each foreign key becomes an indexed integer column that references the parent's `id` with `ON DELETE RESTRICT`. Writes that point at a missing parent, and deletes of a parent that still has children, get a `409`. The foreign key can be used in `?where=`, `?sort=` and composite `indexes` like any indexed field.
+
+`?include=author,comments` on `read` and `read/:id` loads the named associations with the rows. A `belongsTo` is a `LEFT JOIN` in the same query. A `hasMany` is one extra `SELECT ... WHERE postId IN (...)` for the whole page, so listing 25 posts with their comments costs one query for the comments, not 25. Unknown names get a `400`. Responses with includes skip the read cache and conditional requests, because they contain rows of other tables.
+
+Hand-written handlers that walk associations row by row can use `utils/loader.js`. `loaders(req)` returns per-request loaders such as `loaders(req).Comment.byPostId.load(post.id)` and `loaders(req).User.byId.load(post.authorId)`. Every `load()` made in the same tick of the event loop is answered by a single `WHERE ... IN (...)` query, and repeated keys are only fetched once.
+
+## Regenerating From A Spec
+
+The generator can build every model in one non-interactive pass from a JSON or YAML spec:
+```json
+{
+  "models": [
+    {
+      "name": "Product",
+      "fields": ["title", "price:decimal", "sku:string:unique", "publishedAt:date:index", "notes:text:optional"],
+      "indexes": [["title", "publishedAt"]]
+    },
+    { "name": "Review", "fields": ["body:text", "rating:integer"], "version": true }
+  ]
+}
+```
+
+Fields are `name[:type][:modifier...]`. Types: `string` (default), `text`, `integer`, `bigint`, `float`, `double`, `decimal`, `boolean`, `date`, `dateonly`, `json`, `uuid`. Modifiers: `index` and `unique` add a single-column index, `optional` allows null, `searchable` adds the field to the model's full-text index. Composite indexes go in `indexes`, either as a list of fields or as `{ "fields": [...], "unique": true }`. `"version": true` turns on optimistic locking for the model. `belongsTo` and `hasMany` relate models to each other (see Associations).
+```bash
+python3 generate-sqlite-server.py --spec models.json
+```
+
+Content hashes of every generated file are kept in `.generator-manifest.json`; reruns only rewrite files whose output changed. The manifest also records the options the server was generated with, and every rerun, with or without `--spec`, starts from them. A spec's `options` block and then command-line flags override them. Turn a flag off again with its `--no-` form (`--no-cache`, `--no-cluster`, `--no-write-queue`, `--no-row-counts`, `--no-lazy-routes`), turn off load shedding with `--concurrency-limit 0` and the slow query log with `--slow-query-ms 0`. Route mounts in `index.js` live between the `// <generated-routes>` markers. While `index.js` is unedited it is regenerated in full, so option changes reach it. Once you edit it, only the block between the markers is updated, and the file is not written at all when the block is unchanged, so anything you add outside the markers survives every rerun.
+
+## SQLite Performance Profile
+
+Generating with `--profile throughput` (or `"options": { "profile": "throughput" }` in a spec) makes `config/database.js` tune every SQLite connection on startup:
+
+| Pragma | Value | Effect |
+| --- | --- | --- |
+| `journal_mode` | `WAL` | Readers no longer block the writer and vice versa |
+| `synchronous` | `NORMAL` | fsync at WAL checkpoints instead of on every commit |
+| `mmap_size` | 256 MB | Reads are served from memory-mapped pages |
+| `cache_size` | 64 MB | Larger page cache per connection |
+| `temp_store` | `MEMORY` | Sorts and temp indexes stay off disk |
+| `busy_timeout` | 5000 ms | Writers wait for the lock instead of failing with `SQLITE_BUSY` |
+
+**Durability trade-off:** with `synchronous=NORMAL` in WAL mode a commit is acknowledged before it is fsynced. An application crash loses nothing, but a power loss or OS crash can roll back the last transactions committed since the previous checkpoint. The database file itself is never corrupted. Keep the default profile when every acknowledged write must survive power loss. WAL mode also adds `database.sqlite-wal` and `database.sqlite-shm` next to the database; copy all three when backing up a running server.
+
+## HTTP Tuning
+
+Responses of at least `COMPRESSION_THRESHOLD` bytes (default 1024) are compressed with brotli when the client accepts it and gzip otherwise. Smaller ones go out as-is, since compressing them costs more than it saves. Send `x-no-compression: 1` to turn it off for a request.
+
+JSON and form bodies are capped at `BODY_LIMIT` (default `1mb`), so a large bulk request is refused with `413` before it is buffered. Split bigger batches, or stream them through `/import`, which has no cap.
+
+Idle keep-alive connections stay open for `KEEP_ALIVE_TIMEOUT_MS` (default 65000). This is longer than the 60 s idle timeout most reverse proxies and load balancers use, so the proxy closes the connection first and never reuses a socket that Node is about to close. `headersTimeout` is set one second higher, as Node requires.
+
+The generation-time defaults come from `--compression-threshold`, `--body-limit` and `--keep-alive-timeout-ms`. The environment variables below override them at runtime.
+
+## Metrics
+
+`GET /metrics` serves Prometheus text format:
+
+- `http_request_duration_seconds` - Histogram labelled by `method`, `route` and `status`. `route` is the Express route pattern (`/api/Product/read/:id`), so record ids never become label values. Requests that match no route share `route="unmatched"`.
+- `http_requests_in_flight` - Requests currently being handled
+- `db_query_duration_seconds` - Histogram of every Sequelize query, labelled by statement `type` (`SELECT`, `INSERT`, ...)
+- `process_resident_memory_bytes`, `process_uptime_seconds`, plus cache, write-queue and load-shedding counters when those are generated
+
+`middleware/metrics.js` has no dependencies. Recording a request is a couple of array increments, and the text is only built when `/metrics` is scraped, so it is safe to leave on under load. Buckets run from 1 ms to 5 s; edit `BUCKETS` to change them.
+
+## Load Shedding
+
+Without a limit, a burst of requests queues without bound behind the SQLite lock until clients time out. Servers generated with `--concurrency-limit 32` run every `/api` request through `middleware/limiter.js` before its body is parsed:
+
+- At most `limit` requests run at once. The limit starts at `CONCURRENCY_MAX` (the generated value), drops by 10% when reads or single writes take longer than `LATENCY_TARGET_MS` (default 100), and grows back while they are fast. It never goes below `CONCURRENCY_MIN` (default 2).
+- Requests over the limit wait in a queue of up to `QUEUE_MAX` (default four times the limit). Reads go first, then single-record writes, then bulk writes, imports and exports. When the queue is full, a new read turns away the newest bulk request waiting instead of being refused itself.
+- A request gets `503` with a `Retry-After` header right away when the queue is full, or when the requests ahead of it would keep it waiting longer than `QUEUE_TIMEOUT_MS` (default 500). One that still waits that long is answered with `503` too.
+
+`GET /_stats` reports the current `limit`, `inFlight`, queue depth per priority, `averageMs` and the number of requests shed for each reason. `/metrics` has the same figures as `concurrency_limit`, `concurrency_queued` and `requests_shed_total`. In cluster mode each worker has its own limit.
+
+## Slow-Query Log
+
+Servers generated with `--slow-query-ms 50` log every query that takes longer than `SLOW_QUERY_MS` milliseconds as one JSON line on stderr:
+
+```json
+{"level":"warn","msg":"slow query","ms":84,"type":"SELECT","sql":"SELECT ... WHERE `notes` = 'x' ...","plan":["SCAN products"],"fullScan":true}
+```
+
+The first time a query shape is seen (the same SQL with different literal values counts as one shape), the server also runs `EXPLAIN QUERY PLAN` on it. A `SCAN <table>` step with `fullScan: true` means SQLite read the whole table: add `:index` to the field it filters or sorts on and regenerate. Later occurrences of the same shape are logged without the plan.
+
+## Cluster Mode
+
+Servers generated with `--cluster` also get `cluster.js`. Start it with `npm run start:cluster` instead of `index.js`, and it runs one copy of the server per CPU core (`WEB_CONCURRENCY` overrides the count), all on the same port. The primary process syncs the schema once and then forks the workers. Each worker opens its own connection to `database.sqlite` in WAL mode, so reads run in parallel on every core. Writes still go one at a time. Every transaction starts with `BEGIN IMMEDIATE`, so it takes the write lock before its first read, and `busy_timeout` makes it wait its turn for that lock. A default `DEFERRED` transaction that reads before it writes, like the bulk routes, would instead fail with `SQLITE_BUSY` straight away whenever another worker had committed in between, because SQLite cannot upgrade its read snapshot to a write.
+
+- A worker that crashes is replaced after one second.
+- `kill -HUP <primary pid>` restarts the workers one at a time, for example after a deploy. The primary first applies any new migrations; if one fails, the restart is abandoned and the current workers keep serving. Each new worker is listening before the old one stops, so no request is dropped.
+- `SIGTERM`/`SIGINT` stop every worker. Each one finishes its in-flight requests first, or is killed after `SHUTDOWN_TIMEOUT_MS` (default 10000).
+- With `--cache`, every worker keeps its own read cache and invalidations are relayed through the primary.
+- `GET /_stats` and `GET /metrics` describe only the worker that answered. Give each Prometheus target its own single-process server when you need exact per-instance series.
+
+To measure the difference on your own hardware, seed some rows and run the same load against each mode:
+
+```bash
+npm start &                      # single process
+npx autocannon -c 100 -d 30 "http://localhost:3002/api/{model}/read?limit=25"
+kill %1
+
+npm run start:cluster &          # one worker per core
+npx autocannon -c 100 -d 30 "http://localhost:3002/api/{model}/read?limit=25"
+```
+
+Compare `Req/Sec` and the p99 latency. Read-heavy traffic should scale with the number of cores until the disk or the network is saturated. Write-heavy traffic will not scale, because SQLite commits one transaction at a time whatever the number of processes.
+
+## Lazy Routes
+
+By default `index.js` requires every router at startup, and with it every controller and model, so startup time grows with the number of models. In servers generated with `--lazy-routes`, each prefix is mounted through `lazyRoute()` from `utils/lazy.js`. The router is required only when the first request under `/api/{model}` arrives. That request pays the load cost once, and later requests go straight to the cached router. Use this when a server has many models but a given process only serves a few of them, or when restarts have to be fast.
+
+To compare eager and lazy cold starts, run the generator benchmark from a generated server directory, where `npm install` has already run:
+
+```bash
+python3 generate-sqlite-server.py --benchmark 200
+```
+
+It starts `node index.js` for a quarter, half and all of the models, in both modes, and prints the milliseconds until each one is listening.
+
+## Write Queue
+
+Without it, every concurrent `POST /create` opens its own SQLite connection and transaction, and under load they fight over the database lock. Servers generated with `--write-queue` send every create, update, delete, bulk and import write through `utils/writer.js` instead:
+
+- One long-lived writer connection runs one transaction at a time.
+- Writes that arrive within `WRITE_BATCH_WINDOW_MS` (default 2) of each other are committed together, up to `WRITE_BATCH_MAX` (default 200) per transaction. A hundred concurrent creates cost one commit instead of a hundred.
+- Each write runs in its own savepoint. One that fails validation or hits a unique constraint is rolled back and answered with its own error, and the rest of the batch still commits. No caller gets a response until the commit has succeeded.
+- Reads use a separate connection marked `query_only`. The database runs in WAL mode, so reads never wait for the writer.
+
+`GET /_stats` reports `operations`, `batches`, `averageBatch`, `largestBatch`, `failed` and `pending`. In cluster mode each worker has its own queue, and `busy_timeout` orders the workers' commits.
+
+You can also queue your own writes: `await enqueueWrite((transaction) => Model.create(values, { transaction }))`.
+
 ## Environment Variables
 
 - `PORT` - Server port (default: 3002)
+- `BODY_LIMIT`, `COMPRESSION_THRESHOLD`, `KEEP_ALIVE_TIMEOUT_MS` - See HTTP Tuning
+- `WEB_CONCURRENCY`, `SHUTDOWN_TIMEOUT_MS` - See Cluster Mode
+- `WRITE_BATCH_WINDOW_MS`, `WRITE_BATCH_MAX` - See Write Queue
+- `SLOW_QUERY_MS` - See Slow-Query Log
+- `CONCURRENCY_MAX`, `CONCURRENCY_MIN`, `QUEUE_MAX`, `QUEUE_TIMEOUT_MS`, `LATENCY_TARGET_MS` - See Load Shedding
 
 ## Database
 
-The SQLite database file `database.sqlite` is automatically created in the project root. The database is managed through Sequelize ORM with automatic migrations.
+The SQLite database file `database.sqlite` is automatically created in the project root. The database is managed through Sequelize ORM with versioned migrations.
+
+### Migrations
+
+The server does not call `sequelize.sync()`. Each generator run compares the spec with the models recorded in `.generator-manifest.json` and writes the difference to a new `migrations/<UTC timestamp>-<summary>.js`. The first migration is a baseline that creates every table. In a directory made before the manifest existed, the baseline also covers the models that `index.js` already mounts, read back from their files in `models/`. If one of those files has been edited, the prompt stops and asks you to re-run with `--spec` listing every model. The generator can emit these steps:
+
+- Create tables, add columns, change a column's type or nullability, and remove columns
+- Add and drop indexes, and rebuild the full-text index
+- Add foreign-key columns, with their indexes, for new `belongsTo` associations
+- Add or drop the `_counts` triggers when `--row-counts` is turned on or off
+
+Migrations that change or remove a column rebuild the table, which SQLite does by dropping and recreating it. They are marked `rebuildsTables: true`. These run on one connection with an explicit `BEGIN`/`COMMIT`: foreign keys are switched off before `BEGIN`, and `PRAGMA foreign_key_check` runs before the commit, so a parent table with child rows can still be rebuilt. Their `transaction` argument is `null`. Set the flag yourself on hand-written migrations that rebuild tables. Removed models are reported but their tables are kept. Added required fields are created nullable, because SQLite cannot add a `NOT NULL` column without a default to a table that already has rows; the model still requires them on every write.
+
+On startup `connectDB` reads one row, `_schema_version`. If it already names the newest migration file, nothing else happens. Otherwise the pending migrations run in name order, each in a transaction together with its row in `_migrations`. Run `npm run migrate` to apply them ahead of a deploy without starting the server. Migrations are plain JavaScript, so review them, and add data backfills if needed, before they run anywhere.
 
 ## Troubleshooting
 
@@ -370,86 +3329,284 @@ pnpm rebuild sqlite3
     else:
         return print("README.md file already exists, skipping...")
 
+# ----------------------------------------- Spec files ----------------------------
+def apply_options(options):
+    for key, value in options.items():
+        if key not in generator_options:
+            print(f"⚠️  Unknown generator option {key}, ignoring...")
+        elif key == "body_limit" and value is not None and not re.match(r"^\d+(b|kb|mb|gb)?$", str(value).lower()):
+            sys.exit(f"❌ body_limit {value!r} should look like 512kb or 5mb")
+        elif key == "concurrency_limit" and value is not None and (not isinstance(value, int) or value < 0):
+            sys.exit(f"❌ concurrency_limit {value!r} should be a positive number of requests")
+        elif key == "concurrency_limit" and value == 0:
+            generator_options[key] = None
+        elif key == "bulk_chunk_size" and value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 1):
+            sys.exit(f"❌ bulk_chunk_size {value!r} should be at least 1 row")
+        elif key == "slow_query_ms" and value is not None and (not isinstance(value, int) or value < 0):
+            sys.exit(f"❌ slow_query_ms {value!r} should be a positive number of milliseconds")
+        elif key == "slow_query_ms" and value == 0:
+            generator_options[key] = None
+        elif value is not None:
+            generator_options[key] = value
+
+def load_spec(spec_path):
+    with open(spec_path, encoding="utf-8") as spec_file:
+        if spec_path.endswith((".yml", ".yaml")):
+            if yaml is None:
+                sys.exit("❌ YAML specs need PyYAML - install with: pip install pyyaml")
+            spec = yaml.safe_load(spec_file)
+        else:
+            spec = json.load(spec_file)
+    models = spec.get("models") if isinstance(spec, dict) else spec
+    # Accept both a list of {name, fields} entries and a {Name: [fields]} mapping
+    if isinstance(models, dict):
+        models = [{"name": name, "fields": fields} for name, fields in models.items()]
+    if not models:
+        sys.exit(f"❌ No models found in {spec_path}")
+    seen = set()
+    for model in models:
+        if not model.get("name") or not isinstance(model.get("fields"), list):
+            sys.exit(f"❌ Every model in {spec_path} needs a name and a list of fields")
+        if model["name"] in seen:
+            sys.exit(f"❌ Model {model['name']} is defined twice in {spec_path}")
+        seen.add(model["name"])
+    return normalize_models(models), spec.get("options", {}) if isinstance(spec, dict) else {}
+
+def benchmark_generation(model_count, field_count=8):
+    models = [{"name": f"Model{i}", "fields": [f"field{j}" for j in range(field_count)]} for i in range(model_count)]
+    output_path = tempfile.mkdtemp(prefix="sqlite-server-bench-")
+    try:
+        started = time.perf_counter()
+        files = render_server_files(models)
+        rendered = time.perf_counter()
+        hashes, written = write_generated_files(output_path, files)
+        written_at = time.perf_counter()
+        write_generated_files(output_path, render_server_files(models), hashes)
+        finished = time.perf_counter()
+    finally:
+        shutil.rmtree(output_path, ignore_errors=True)
+    print(f"⏱️  {model_count} models x {field_count} fields -> {len(written)} files")
+    print(f"   render: {(rendered - started) * 1000:.1f} ms")
+    print(f"   write:  {(written_at - rendered) * 1000:.1f} ms")
+    print(f"   rerun:  {(finished - written_at) * 1000:.1f} ms (nothing changed)")
+    benchmark_cold_start(model_count, field_count)
+
+def measure_cold_start(output_path, timeout=30):
+    # Time from spawning node until index.js logs that it is listening, i.e. every eager require() has run
+    env = dict(os.environ, PORT="0", NODE_ENV="production")
+    started = time.perf_counter()
+    process = subprocess.Popen(["node", "index.js"], cwd=output_path, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    try:
+        deadline = started + timeout
+        for line in process.stdout:
+            if "Listening on port" in line:
+                return (time.perf_counter() - started) * 1000
+            if time.perf_counter() > deadline:
+                break
+        return None
+    finally:
+        process.kill()
+        process.wait()
+
+def benchmark_cold_start(model_count, field_count=8):
+    node_modules = os.path.join(current_path, "node_modules")
+    if not shutil.which("node") or not os.path.isdir(node_modules):
+        print("   cold start: skipped (needs node and an installed node_modules in the current directory)")
+        return
+    counts = sorted({max(1, model_count // 4), max(1, model_count // 2), model_count})
+    lazy_routes = generator_options["lazy_routes"]
+    print("   cold start (ms to listening):")
+    print(f"   {'models':>8} {'eager':>10} {'lazy':>10}")
+    try:
+        for count in counts:
+            models = [{"name": f"Model{i}", "fields": [f"field{j}" for j in range(field_count)]} for i in range(count)]
+            timings = []
+            for lazy in (False, True):
+                generator_options["lazy_routes"] = lazy
+                output_path = tempfile.mkdtemp(prefix="sqlite-server-bench-")
+                try:
+                    write_generated_files(output_path, render_server_files(models))
+                    os.symlink(node_modules, os.path.join(output_path, "node_modules"))
+                    elapsed = measure_cold_start(output_path)
+                finally:
+                    shutil.rmtree(output_path, ignore_errors=True)
+                timings.append("failed" if elapsed is None else f"{elapsed:.1f}")
+            print(f"   {count:>8} {timings[0]:>10} {timings[1]:>10}")
+    finally:
+        generator_options["lazy_routes"] = lazy_routes
+
 # ----------------------------------------- Create folders for all of the files ----------------------------
 config_directory = os.path.join(current_path, "config")
 controller_directory = os.path.join(current_path, "controllers")
 middleware_directory = os.path.join(current_path, "middleware")
 model_directory = os.path.join(current_path, "models")
 route_directory = os.path.join(current_path, "routes")
+utils_directory = os.path.join(current_path, "utils")
 
-print("Creating needed folders...")
+def create_directories():
+    print("Creating needed folders...")
 
-directories = [config_directory, controller_directory, middleware_directory, model_directory, route_directory]
-directory_names = ["Config", "Controller", "Middleware", "Model", "Route"]
+    directories = [config_directory, controller_directory, middleware_directory, model_directory, route_directory, utils_directory]
+    directory_names = ["Config", "Controller", "Middleware", "Model", "Route", "Utils"]
 
-for directory, name in zip(directories, directory_names):
-    if os.path.exists(directory):
-        print(f"{name} path already exists.")
-    else:
-        os.mkdir(directory)
-        print(f"{name} directory created.")
+    for directory, name in zip(directories, directory_names):
+        if os.path.exists(directory):
+            print(f"{name} path already exists.")
+        else:
+            os.mkdir(directory)
+            print(f"{name} directory created.")
 
 # ----------------------------------------- Call everything ----------------------------
-print("\n🚀 SQLite Node.js Server Generator")
-print("=" * 50)
-
-type_of_db = input("What are you storing in the DB? (e.g., Product, User, Post): ")
-db_item_amount = input("How many fields do you need in each document? ")
-
-db_items = []
-db_item_amount_list = [0] * int(db_item_amount)
-
-print(f"\nEnter {db_item_amount} field names for {type_of_db}:")
-for i, item in enumerate(db_item_amount_list, 1):
-    db_item_name = input(f"Field {i} name: ")
-    db_items.append(db_item_name)
-
-print("\n🔧 Generating your SQLite server...")
-print("-" * 40)
-
-print("✅ Adding config files...")
-create_config_files()
-
-print("✅ Adding controller files...")
-create_controller_files(type_of_db, db_items)
-
-print("✅ Adding route files...")
-create_routes_files(type_of_db)
-
-print("✅ Adding model files...")
-create_models_files(type_of_db, db_items)
-
-print("✅ Adding index file...")
-create_index_file(type_of_db)
-
-print("✅ Adding package.json...")
-create_package_file()
-
-print("✅ Adding .env file...")
-create_env_file()
-
-print("✅ Adding .npmrc file...")
-create_npmrc_file()
-
-print("✅ Creating database.sqlite...")
-create_database_file()
-
-print("✅ Adding Docker files...")
-create_docker_files()
-
-print("✅ Adding .gitignore...")
-create_gitignore()
-
-print("✅ Adding README.md...")
-create_readme_file()
-
-print("\n" + "=" * 50)
-print("🎉 Your SQLite Node.js App Is Ready!")
-print("=" * 50)
-print("\nNext steps:")
-print("1. Run 'pnpm install' to install dependencies")
-print("2. Run 'pnpm rebuild sqlite3' to build native module")
-print("3. Run 'pnpm start' to start the server")
-print("4. Or use 'docker build -t sqlite-server .' to build with Docker")
-print("\n📖 Check README.md for detailed instructions")
-
+def ask_for_model():
+    type_of_db = input("What are you storing in the DB? (e.g., Product, User, Post): ")
+    db_item_amount = input("How many fields do you need in each document? ")
+
+    db_items = []
+    db_item_amount_list = [0] * int(db_item_amount)
+
+    print(f"\nEnter {db_item_amount} field names for {type_of_db} (optionally typed, e.g. price:decimal or email:string:unique):")
+    for i, item in enumerate(db_item_amount_list, 1):
+        db_item_name = input(f"Field {i} name: ")
+        db_items.append(db_item_name)
+    return normalize_model({"name": type_of_db, "fields": db_items})
+
+def generate_server(models, manifest, interactive=False):
+    print("\n🔧 Generating your SQLite server...")
+    print("-" * 40)
+
+    if interactive:
+        # Each prompt run adds one model on top of everything generated before it
+        models = [model for model in manifest["models"] if model["name"] != models[0]["name"]] + models
+
+    print("✅ Rendering config, controller, route, model and index files...")
+    files = render_server_files(models)
+
+    route_names = [model["name"] for model in models]
+    index_file_path = os.path.join(current_path, "index.js")
+    index_template = file_hash(files["index.js"])
+    previous_hashes = dict(manifest["files"])
+    if path.exists(index_file_path):
+        with open(index_file_path, encoding="utf-8") as index_file:
+            existing_index = index_file.read()
+        if interactive:
+            mounted_names = mounted_route_names(existing_index)
+            route_names = mounted_names + [name for name in route_names if name not in mounted_names]
+            files["index.js"] = render_index_file(route_names)
+            index_template = file_hash(files["index.js"])
+        # index.js is replaced wholesale only while it is exactly the template the generator last wrote.
+        # Once edited, only the route block is merged in, on every run, and the file is left untouched
+        # when that changes nothing.
+        if file_hash(existing_index) != manifest.get("index_template"):
+            print("index.js file already exists...Updating generated routes...")
+            files["index.js"] = merge_index_file(existing_index, route_names)
+            index_template = manifest.get("index_template")
+        previous_hashes["index.js"] = file_hash(existing_index)
+
+    hashes, written = write_generated_files(current_path, files, previous_hashes)
+    migration = write_migration(current_path, manifest["models"], models, manifest["options"].get("row_counts", False))
+    if migration:
+        print(f"✅ Wrote migrations/{migration}...")
+    print(f"✅ Wrote {len(written)} changed files, {len(files) - len(written)} unchanged...")
+    for stale_path in sorted(set(manifest["files"]) - set(hashes)):
+        print(f"ℹ️ {stale_path} is no longer generated, leaving it in place...")
+    save_manifest(current_path, models, hashes, index_template)
+
+    print("✅ Adding .env file...")
+    create_env_file()
+
+    print("✅ Adding .npmrc file...")
+    create_npmrc_file()
+
+    print("✅ Creating database.sqlite...")
+    create_database_file()
+
+    print("✅ Adding Docker files...")
+    create_docker_files()
+
+    print("✅ Adding .gitignore...")
+    create_gitignore()
+
+    print("✅ Adding README.md...")
+    create_readme_file()
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite Node.js Server Generator")
+    parser.add_argument("--spec", help="JSON or YAML file listing every model and its fields (skips the prompts)")
+    parser.add_argument("--benchmark", type=int, metavar="MODELS", help="time generating MODELS synthetic models into a temp directory")
+    parser.add_argument("--profile", choices=["default", "throughput"], help="SQLite pragma profile for config/database.js")
+    parser.add_argument("--pagination", choices=["cursor", "offset"], help="list endpoints page by keyset cursor (default) or by page/offset")
+    parser.add_argument("--bulk-chunk-size", type=int, help="rows per statement in the generated bulk endpoints (default 500)")
+    parser.add_argument("--cache", action=argparse.BooleanOptionalAction, help="emit an in-process LRU cache for read endpoints (middleware/cache.js)")
+    parser.add_argument("--cache-max-entries", type=int, help="responses kept by the read cache (default 1000)")
+    parser.add_argument("--cache-ttl-ms", type=int, help="how long a cached response stays fresh (default 30000)")
+    parser.add_argument("--body-limit", help="largest JSON or form body the server accepts, e.g. 512kb or 5mb (default 1mb)")
+    parser.add_argument("--compression-threshold", type=int, help="smallest response in bytes that gets gzip/brotli compressed (default 1024)")
+    parser.add_argument("--keep-alive-timeout-ms", type=int, help="how long idle keep-alive connections stay open (default 65000)")
+    parser.add_argument("--cluster", action=argparse.BooleanOptionalAction, help="emit cluster.js, which runs one server worker per CPU over a WAL database")
+    parser.add_argument("--slow-query-ms", type=int, help="log queries slower than this as JSON, with EXPLAIN QUERY PLAN the first time each is seen (0 turns it off)")
+    parser.add_argument("--lazy-routes", action=argparse.BooleanOptionalAction, help="load each model's router, controller and model on the first request to it")
+    parser.add_argument("--concurrency-limit", type=int, metavar="N", help="run at most N API requests at once, queue a few more by priority and answer the rest with 503 (0 turns it off)")
+    parser.add_argument("--row-counts", action=argparse.BooleanOptionalAction, help="keep each table's row count in a trigger-maintained _counts table instead of running COUNT(*)")
+    parser.add_argument("--write-queue", action=argparse.BooleanOptionalAction, help="funnel every write through one group-committing writer connection (utils/writer.js)")
+    args = parser.parse_args()
+    cli_options = {
+        "profile": args.profile,
+        "pagination": args.pagination,
+        "bulk_chunk_size": args.bulk_chunk_size,
+        "cache": args.cache,
+        "cache_max_entries": args.cache_max_entries,
+        "cache_ttl_ms": args.cache_ttl_ms,
+        "body_limit": args.body_limit,
+        "compression_threshold": args.compression_threshold,
+        "keep_alive_timeout_ms": args.keep_alive_timeout_ms,
+        "cluster": args.cluster,
+        "write_queue": args.write_queue,
+        "slow_query_ms": args.slow_query_ms,
+        "lazy_routes": args.lazy_routes,
+        "concurrency_limit": args.concurrency_limit,
+        "row_counts": args.row_counts,
+    }
+
+    if args.benchmark:
+        apply_options(cli_options)
+        return benchmark_generation(args.benchmark)
+
+    print("\n🚀 SQLite Node.js Server Generator")
+    print("=" * 50)
+
+    manifest = load_manifest(current_path)
+    legacy_names = []
+    if not path.exists(os.path.join(current_path, manifest_file_name)):
+        # Without a manifest the baseline migration still has to create the tables the old routes use
+        manifest["models"], unreadable = legacy_models(current_path)
+        legacy_names = [model["name"] for model in manifest["models"]] + unreadable
+        if unreadable and not args.spec:
+            sys.exit(f"❌ There is no {manifest_file_name} here and models/ does not describe {', '.join(unreadable)}; re-run with --spec listing every model")
+    # Reruns keep the options the server was generated with; --no-<flag> turns one off again
+    apply_options(manifest["options"])
+    if args.spec:
+        models, spec_options = load_spec(args.spec)
+        apply_options(spec_options)
+        print(f"📄 Loaded {len(models)} models from {args.spec}")
+        for name in legacy_names:
+            if name not in [model["name"] for model in models]:
+                print(f"⚠️  {name} is already in this directory but not in the spec; the baseline migration will not create its table...")
+    else:
+        models = [ask_for_model()]
+    apply_options(cli_options)
+
+    create_directories()
+    generate_server(models, manifest, interactive=not args.spec)
+
+    print("\n" + "=" * 50)
+    print("🎉 Your SQLite Node.js App Is Ready!")
+    print("=" * 50)
+    print("\nNext steps:")
+    print("1. Run 'pnpm install' to install dependencies")
+    print("2. Run 'pnpm rebuild sqlite3' to build native module")
+    print("3. Run 'pnpm start' to start the server")
+    print("4. Or use 'docker build -t sqlite-server .' to build with Docker")
+    print("\n📖 Check README.md for detailed instructions")
+
+if __name__ == "__main__":
+    main()